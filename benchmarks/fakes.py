@@ -0,0 +1,204 @@
+# #######
+# Copyright (c) 2021 Cloudify Platform Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Fake dcmanager and cgts clients backed by a generated StarlingX fleet."""
+
+import time
+import random
+from threading import Lock
+from collections import Counter
+from types import SimpleNamespace
+
+SYSTEM_UUID = '00000000-0000-0000-0000-000000000000'
+
+
+class FakeAPIFailure(Exception):
+    pass
+
+
+class FakeBackend(object):
+    """A system controller with a number of subclouds.
+
+    :param subclouds: The number of subclouds.
+    :param groups: The number of subcloud groups.
+    :param hosts: The number of hosts of the system controller.
+    :param latency: Seconds that every API call takes.
+    :param failure_rate: The share of subcloud detail calls that fail.
+    :param offline_rate: The share of subclouds that are offline.
+    :param seed: The seed for the failures and offline subclouds.
+    """
+
+    def __init__(self,
+                 subclouds=100,
+                 groups=8,
+                 hosts=2,
+                 latency=0.0,
+                 failure_rate=0.0,
+                 offline_rate=0.0,
+                 seed=0):
+        self.latency = latency
+        self.calls = Counter()
+        self._lock = Lock()
+        rand = random.Random(seed)
+        self.groups = [
+            SimpleNamespace(group_id=group_id,
+                            name='group{0}'.format(group_id),
+                            description='')
+            for group_id in range(1, groups + 1)]
+        self.subclouds = []
+        self.failing = set()
+        for subcloud_id in range(1, subclouds + 1):
+            self.subclouds.append(SimpleNamespace(
+                subcloud_id=subcloud_id,
+                name='subcloud{0}'.format(subcloud_id),
+                description='Subcloud {0}'.format(subcloud_id),
+                location='Location {0}'.format(subcloud_id),
+                group_id=subcloud_id % groups + 1,
+                availability_status='offline'
+                if rand.random() < offline_rate else 'online',
+                management_state='managed',
+                updated_at='2021-10-01 10:00:00'))
+            if rand.random() < failure_rate:
+                self.failing.add(subcloud_id)
+        self.system = SimpleNamespace(
+            uuid=SYSTEM_UUID,
+            name='controller',
+            description='',
+            location='',
+            system_type='Standard',
+            system_mode='duplex',
+            region_name='RegionOne',
+            latitude='45.4',
+            longitude='-75.7',
+            distributed_cloud_role='systemcontroller')
+        self.hosts = [
+            SimpleNamespace(uuid='host-{0}'.format(host),
+                            hostname='controller-{0}'.format(host),
+                            personality='controller',
+                            isystem_uuid=SYSTEM_UUID,
+                            capabilities={'stor_function': 'monitor'},
+                            subfunctions='controller,worker')
+            for host in range(hosts)]
+        self.kube_clusters = [
+            SimpleNamespace(cluster_name='kubernetes',
+                            cluster_version='v1.21.8',
+                            cluster_api_endpoint='https://10.10.10.2:6443',
+                            admin_user='kubernetes-admin',
+                            admin_token='Zm9vCg==',
+                            admin_client_cert='-' * 2048,
+                            admin_client_key='-' * 2048,
+                            cluster_ca_cert='-' * 2048)]
+        self.service_parameters = [
+            SimpleNamespace(uuid='parameter-0',
+                            service='openstack',
+                            section='identity',
+                            name='url',
+                            value='http://10.10.10.3:5000/v3')]
+
+    def call(self, name):
+        with self._lock:
+            self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def dcmanager_client(self, *_, **__):
+        return FakeDCManagerClient(self)
+
+    def cgts_client(self, *_, **__):
+        return FakeCgtsClient(self)
+
+
+class FakeManager(object):
+
+    def __init__(self, backend, name):
+        self.backend = backend
+        self.name = name
+
+    def call(self, method):
+        self.backend.call('{0}.{1}'.format(self.name, method))
+
+
+class FakeSubcloudManager(FakeManager):
+
+    def list_subclouds(self):
+        self.call('list_subclouds')
+        return list(self.backend.subclouds)
+
+    def subcloud_additional_details(self, subcloud_id):
+        self.call('subcloud_additional_details')
+        if subcloud_id in self.backend.failing:
+            raise FakeAPIFailure(
+                'Failed to get subcloud {0}.'.format(subcloud_id))
+        subcloud = self.backend.subclouds[int(subcloud_id) - 1]
+        detail = SimpleNamespace(**vars(subcloud))
+        detail.oam_floating_ip = '10.{0}.{1}.2'.format(
+            subcloud.subcloud_id // 256, subcloud.subcloud_id % 256)
+        return [detail]
+
+
+class FakeSubcloudGroupManager(FakeManager):
+
+    def list_subcloud_groups(self):
+        self.call('list_subcloud_groups')
+        return list(self.backend.groups)
+
+    def subcloud_group_detail(self, group_id):
+        self.call('subcloud_group_detail')
+        return [self.backend.groups[int(group_id) - 1]]
+
+
+class FakeDCManagerClient(object):
+
+    def __init__(self, backend):
+        self.subcloud_manager = FakeSubcloudManager(
+            backend, 'subcloud_manager')
+        self.subcloud_group_manager = FakeSubcloudGroupManager(
+            backend, 'subcloud_group_manager')
+
+
+class FakeListManager(FakeManager):
+
+    def __init__(self, backend, name, items, key):
+        super(FakeListManager, self).__init__(backend, name)
+        self.items = items
+        self.key = key
+
+    def list(self):
+        self.call('list')
+        return list(self.items)
+
+    def get(self, resource_id):
+        self.call('get')
+        for item in self.items:
+            if getattr(item, self.key) == resource_id:
+                return item
+
+
+class FakeCgtsClient(object):
+
+    def __init__(self, backend):
+        self.isystem = FakeListManager(
+            backend, 'isystem', [backend.system], 'uuid')
+        self.ihost = FakeListManager(
+            backend, 'ihost', backend.hosts, 'uuid')
+        self.kube_cluster = FakeListManager(
+            backend, 'kube_cluster', backend.kube_clusters, 'cluster_name')
+        self.service_parameter = FakeListManager(
+            backend, 'service_parameter', backend.service_parameters, 'uuid')
+        self.app = FakeListManager(backend, 'app', [], 'name')
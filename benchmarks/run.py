@@ -0,0 +1,267 @@
+# #######
+# Copyright (c) 2021 Cloudify Platform Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Benchmark subcloud discovery against a fake StarlingX backend.
+
+    python -m benchmarks.run --subclouds 10 100 1000 --latency 0.005 \
+        --output results.json
+
+Every scenario reports the wall time, the number of StarlingX API calls
+per subcloud, the REST calls to the manager, and the peak memory and the
+memory still held at the end that tracemalloc saw. The subcloud_resources
+and subcloud_records scenarios keep what discovery holds, to compare the
+memory of resource objects and records. Compare the JSON output of two
+releases to find regressions.
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from cloudify_starlingx.__version__ import version
+from cloudify_starlingx.workflows import discover
+from cloudify_starlingx.utils import update_runtime_properties
+from cloudify_starlingx_sdk.common import connection_registry
+from cloudify_starlingx_sdk.resources.configuration import SystemResource
+from cloudify_starlingx_sdk.resources.distributed_cloud import \
+    SubcloudResource
+
+from .fakes import SYSTEM_UUID, FakeBackend
+
+SCENARIOS = ['system',
+             'subcloud',
+             'runtime_properties',
+             'discover',
+             'subcloud_resources',
+             'subcloud_records']
+CLIENT_CONFIG = {
+    'auth_url': 'http://127.0.0.1:5000/v3',
+    'username': 'admin',
+    'api_key': 'admin',
+    'project_name': 'admin',
+    'region_name': 'RegionOne',
+}
+logger = logging.getLogger('benchmarks')
+
+
+class FakeRestClient(object):
+    """Counts the node instance updates of update_runtime_properties."""
+
+    def __init__(self):
+        self.calls = 0
+        self.bytes = 0
+        self.node_instances = self
+
+    def update(self, node_instance_id, state, runtime_properties, version):
+        self.calls += 1
+        self.bytes += len(json.dumps(runtime_properties))
+        return SimpleNamespace(version=version + 1)
+
+
+class StaticResource(object):
+    """A resource with a precomputed record."""
+
+    def __init__(self, resource_id, record):
+        self.resource_id = resource_id
+        self.record = record
+
+    def to_dict(self):
+        return self.record
+
+
+def get_node_instance():
+    return SimpleNamespace(id='controller_abc123',
+                           node_id='controller',
+                           state='started',
+                           version=1,
+                           runtime_properties={
+                               'resource_config': {
+                                   'distributed_cloud_role':
+                                       'systemcontroller'}})
+
+
+def get_workflow_ctx(node_instance):
+    node = SimpleNamespace(
+        id='controller',
+        properties={'client_config': dict(CLIENT_CONFIG),
+                    'resource_config': {'uuid': SYSTEM_UUID}},
+        instances=[node_instance])
+    return SimpleNamespace(logger=logger,
+                           get_node=lambda node_id: node,
+                           deployment=SimpleNamespace(id='controller'))
+
+
+def get_system(backend, max_workers):
+    return SystemResource(client_config=dict(CLIENT_CONFIG),
+                          resource_config={'uuid': SYSTEM_UUID},
+                          logger=logger,
+                          max_workers=max_workers,
+                          subcloud_filter={})
+
+
+def run_system(backend, args, rest_client):
+    system = get_system(backend, args.max_workers)
+    system.to_dict()
+    for subcloud in system.subcloud_resources:
+        subcloud.to_dict()
+
+
+def run_subcloud_resources(backend, args, rest_client):
+    system = get_system(backend, args.max_workers)
+    resources = system.subcloud_resources
+    for subcloud in resources:
+        subcloud.to_dict()
+    return system
+
+
+def run_subcloud_records(backend, args, rest_client):
+    system = get_system(backend, args.max_workers)
+    return system, list(system.iter_subcloud_records())
+
+
+def run_subcloud(backend, args, rest_client):
+    for subcloud in backend.subclouds:
+        try:
+            SubcloudResource(
+                client_config=dict(CLIENT_CONFIG),
+                resource_config={'subcloud_id': subcloud.subcloud_id},
+                logger=logger).to_dict()
+        except Exception:  # noqa
+            continue
+
+
+def run_runtime_properties(backend, args, rest_client):
+    resources = [
+        StaticResource(subcloud.subcloud_id,
+                       {str(subcloud.subcloud_id): vars(subcloud)})
+        for subcloud in backend.subclouds]
+    update_runtime_properties(instance=get_node_instance(),
+                              resources=resources,
+                              prop_name='subclouds',
+                              rest_client=rest_client,
+                              chunk_size=args.chunk_size)
+
+
+def run_discover(backend, args, rest_client):
+    ctx = get_workflow_ctx(get_node_instance())
+    with patch('cloudify_starlingx.utils.wtx', ctx), \
+            patch('cloudify_starlingx.workflows.discover.wtx', ctx):
+        discover.discover_subclouds(node_id='controller',
+                                    max_workers=args.max_workers,
+                                    subcloud_filter={},
+                                    chunk_size=args.chunk_size,
+                                    ctx=ctx)
+
+
+def run_scenario(scenario, subclouds, args):
+    backend = FakeBackend(subclouds=subclouds,
+                          groups=args.groups,
+                          latency=args.latency,
+                          failure_rate=args.failure_rate,
+                          seed=args.seed)
+    rest_client = FakeRestClient()
+    connection_registry.clear()
+    run = globals()['run_{0}'.format(scenario)]
+    with patch('cloudify_starlingx_sdk.resources.distributed_cloud.client',
+               SimpleNamespace(client=backend.dcmanager_client)), \
+            patch('cloudify_starlingx_sdk.resources.configuration.get_client',
+                  backend.cgts_client), \
+            patch('cloudify_starlingx.utils.get_rest_client',
+                  return_value=rest_client):
+        tracemalloc.start()
+        start = time.perf_counter()
+        # Scenarios may return what discovery would keep in memory.
+        retained = run(backend, args, rest_client)
+        wall_time = time.perf_counter() - start
+        retained_memory, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del retained
+    connection_registry.clear()
+    return {
+        'scenario': scenario,
+        'subclouds': subclouds,
+        'wall_time': round(wall_time, 6),
+        'api_calls': backend.total_calls,
+        'api_calls_per_subcloud': round(
+            backend.total_calls / float(subclouds), 3),
+        'api_calls_by_method': dict(backend.calls),
+        'rest_calls': rest_client.calls,
+        'rest_bytes': rest_client.bytes,
+        'peak_memory': peak_memory,
+        'retained_memory': retained_memory,
+    }
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--subclouds', type=int, nargs='+',
+                        default=[10, 100, 1000],
+                        help='The fleet sizes to run every scenario with.')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS,
+                        default=SCENARIOS)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds that every fake API call takes.')
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='The share of subcloud detail calls that fail.')
+    parser.add_argument('--groups', type=int, default=8)
+    parser.add_argument('--max-workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None,
+                        help='Write the results as JSON to this file.')
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    logging.basicConfig(level=logging.CRITICAL)
+    results = []
+    for subclouds in args.subclouds:
+        for scenario in args.scenarios:
+            result = run_scenario(scenario, subclouds, args)
+            results.append(result)
+            print('{scenario:<20} {subclouds:>6} subclouds '
+                  '{wall_time:>10.3f}s '
+                  '{api_calls_per_subcloud:>7} calls/subcloud '
+                  '{rest_calls:>5} rest calls '
+                  '{peak_memory:>12} peak '
+                  '{retained_memory:>12} retained bytes'.format(**result))
+    report = {
+        'version': version,
+        'python': platform.python_version(),
+        'parameters': {
+            'latency': args.latency,
+            'failure_rate': args.failure_rate,
+            'groups': args.groups,
+            'max_workers': args.max_workers,
+            'chunk_size': args.chunk_size,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as outfile:
+            json.dump(report, outfile, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    sys.exit(main() and 0)
@@ -1 +1 @@
-version = '0.0.44'
+version = '0.0.45'
@@ -8,3 +8,12 @@ LABELS = {
 
 }
 DEFAULT_REGION = 'RegionOne'
+# The number of independent reads that poststart runs at the same time.
+POSTSTART_MAX_WORKERS = 6
+# The manager REST clients that are kept, one per execution and tenant.
+REST_CLIENT_POOL_SIZE = 8
+# The HTTP connections of a REST client to the manager, which should cover
+# the threads of discovery (max_workers) and of poststart.
+REST_CLIENT_MAX_CONNECTIONS = 10
+# The executions whose resolved secrets, inputs and deployments are kept.
+EXECUTION_CACHE_SIZE = 8
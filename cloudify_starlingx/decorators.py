@@ -25,7 +25,12 @@ from cloudify.exceptions import (OperationRetry, NonRecoverableError)
 from cloudify_starlingx_sdk.common import (
     StarlingXException,
     StarlingXFatalException)
-from .utils import resolve_ctx, validate_auth_url, handle_cert_in_config
+from .utils import (
+    resolve_ctx,
+    validate_auth_url,
+    deployment_cache,
+    handle_cert_in_config,
+    batched_runtime_properties)
 
 
 def with_starlingx_resource(class_decl):
@@ -50,12 +55,17 @@ def with_starlingx_resource(class_decl):
                 cacert,
                 client_config.get('insecure'))
             resource_config = ctx_node.node.properties.get('resource_config')
+            # Read the deployments again in every operation.
+            deployment_cache.invalidate('deployment')
             try:
                 resource = class_decl(
                     client_config=client_config,
                     resource_config=resource_config,
                     logger=ctx.logger)
-                func(resource, ctx)
+                # The runtime properties are stored once, when the
+                # operation ends, or at flush_runtime_properties.
+                with batched_runtime_properties(ctx_node.instance):
+                    func(resource, ctx)
             except StarlingXException as errors:
                 raise OperationRetry(
                     'Attempting WRCP registration again, '
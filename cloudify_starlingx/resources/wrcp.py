@@ -17,69 +17,123 @@ from copy import deepcopy
 
 from cloudify.exceptions import NonRecoverableError
 
-from ..constants import LABELS, DEFAULT_REGION
+from ..constants import (
+    LABELS,
+    DEFAULT_REGION,
+    POSTSTART_MAX_WORKERS)
 from ..decorators import with_starlingx_resource
 from ..utils import (
     assign_site,
-    add_new_label,
+    run_concurrently,
     get_parent_wrcp_ip,
+    update_prop_values,
     update_prop_resource,
     update_prop_resources,
+    get_deployment_snapshot,
+    refresh_deployment_snapshot,
     assign_required_labels,
     update_openstack_props,
     update_kubernetes_props)
 from cloudify_starlingx_sdk.resources.configuration import SystemResource
 from cloudify_starlingx_sdk.resources.distributed_cloud import SubcloudResource
 
+# The default of update_subcloud_resource, when poststart did not already
+# look up the subcloud resource.
+NOT_FETCHED = object()
+
 
 @with_starlingx_resource(SystemResource)
 def poststart(resource, ctx):
     """ Read a system resource and store its properties in the node instance
-    runtime properties.
+    runtime properties. The reads that do not depend on each other run
+    concurrently, and then the properties and labels are written.
 
     :param resource: A system resource.
     :param ctx: The Cloudify context.
     :return:
     """
 
+    if not (resource.is_subcloud or
+            resource.is_system_controller or
+            resource.is_standalone_system):
+        raise NonRecoverableError(
+            'Unsupported system type: '
+            'the system is neither a standalone system, system controller, '
+            'nor a subcloud.')
+
+    # The reads share the client and the system, which are loaded lazily,
+    # so we load them before the threads start.
+    resource.connection
+    resource.resource
+    reads = {
+        'system': resource.to_dict,
+        'hosts': lambda: resource.host_resources,
+        'kube_clusters': lambda: resource.kube_cluster_resources,
+        'openstack_clusters': lambda: resource.openstack_cluster_resource,
+        'applications': lambda: get_application_inventory(resource),
+    }
+    if resource.is_subcloud:
+        reads['subcloud'] = lambda: get_loaded_subcloud_resource(
+            resource, ctx.deployment.id)
+    elif resource.is_system_controller:
+        reads['subcloud_names'] = lambda: resource.subcloud_resource_names
+    results = run_concurrently(reads, ctx, POSTSTART_MAX_WORKERS)
+
     if resource.is_subcloud:
         update_subcloud_resource(resource,
                                  ctx.instance,
-                                 ctx.deployment.id)
-        add_new_label('csys-env-type',
-                      LABELS['types']['subcloud'],
-                      ctx.deployment.id)
+                                 ctx.deployment.id,
+                                 results['subcloud'])
+        env_type = LABELS['types']['subcloud']
     elif resource.is_system_controller:
         if 'subcloud_names' not in ctx.instance.runtime_properties:
             ctx.instance.runtime_properties['subcloud_names'] = []
-        for subcloud_name in resource.subcloud_resource_names:
+        for subcloud_name in results['subcloud_names']:
             ctx.instance.runtime_properties['subcloud_names'].append(
                 subcloud_name)
         # update_prop_resources(
         #     ctx.instance, resource.subcloud_resources, 'subclouds')
-        add_new_label('csys-env-type',
-                      LABELS['types']['systemcontroller'],
-                      ctx.deployment.id)
-    elif not resource.is_standalone_system:
-        raise NonRecoverableError(
-            'Unsupported system type: '
-            'the system is neither a standalone system, system controller, '
-            'nor a subcloud.')
+        env_type = LABELS['types']['systemcontroller']
     else:
-        add_new_label('csys-env-type',
-                      LABELS['types']['default'],
-                      ctx.deployment.id)
+        env_type = LABELS['types']['default']
 
-    update_prop_resource(ctx.instance, resource)
-    update_prop_resources(ctx.instance, resource.host_resources, 'hosts')
+    update_prop_values(ctx.instance, results['system'])
+    update_prop_resources(ctx.instance, results['hosts'], 'hosts')
     update_prop_resources(
-        ctx.instance, resource.kube_cluster_resources, 'kube_clusters')
-    update_kubernetes_props(ctx.instance, resource.kube_cluster_resources)
+        ctx.instance, results['kube_clusters'], 'kube_clusters')
+    update_kubernetes_props(ctx.instance, results['kube_clusters'])
     update_openstack_props(ctx.instance,
-                           resource.openstack_cluster_resource,
+                           results['openstack_clusters'],
                            resource.client_config)
-    assign_required_labels(ctx.instance, ctx.deployment.id)
-    assign_site(ctx.instance, ctx.deployment.id, resource.location)
+    ctx.instance.runtime_properties['applications'] = results['applications']
+
+    # The labels and the site are independent writes to the deployment, so
+    # they run concurrently. The env type label is set with the others, in
+    # one labels update. Both read the deployment, so we load it first.
+    get_deployment_snapshot(ctx.deployment.id)
+    run_concurrently({
+        'labels': lambda: assign_required_labels(
+            ctx.instance,
+            ctx.deployment.id,
+            {'csys-env-type': env_type}),
+        'site': lambda: assign_site(
+            ctx.instance, ctx.deployment.id, resource.location),
+    }, ctx)
+    # Each write refreshed the snapshot with only its own change.
+    refresh_deployment_snapshot(ctx.deployment.id)
+
+
+def get_application_inventory(resource):
+    """ Get the application inventory of a system. The inventory is not
+    required for the install, so if it fails we store an empty inventory.
+    """
+    try:
+        return resource.get_application_inventory()
+    except Exception as e:
+        resource.logger.error(
+            'Failed to get the applications of system {}: {}.'.format(
+                resource.resource_id, e))
+        return {}
 
 
 def get_subcloud_resource(resource, deployment_id):
@@ -97,15 +151,31 @@ def get_subcloud_resource(resource, deployment_id):
         subcloud_resource = SubcloudResource(
             client_config=client_config,
             resource_config={'subcloud_id': subcloud_id},
-            logger=resource.logger)
+            logger=resource.logger,
+            token_cache=resource.token_cache)
         return subcloud_resource
     resource.logger.error(
         'Parent IP was not provided and is required to set '
         'oam_floating_ip and other subcloud values.')
 
 
-def update_subcloud_resource(resource, ctx_instance, deployment_id):
+def get_loaded_subcloud_resource(resource, deployment_id):
+    """ Get the subcloud resource of a subcloud system, with its details
+    already fetched.
+    """
     subcloud_resource = get_subcloud_resource(resource, deployment_id)
+    if subcloud_resource:
+        subcloud_resource.to_dict()
+    return subcloud_resource
+
+
+def update_subcloud_resource(resource,
+                             ctx_instance,
+                             deployment_id,
+                             subcloud_resource=NOT_FETCHED):
+    # None is a result of the lookup, so only look up if it was not done.
+    if subcloud_resource is NOT_FETCHED:
+        subcloud_resource = get_subcloud_resource(resource, deployment_id)
     if subcloud_resource:
         ctx_instance.runtime_properties['oam_floating_ip'] = \
             subcloud_resource.oam_floating_ip
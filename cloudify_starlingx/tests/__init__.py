@@ -16,11 +16,22 @@
 import unittest
 from cloudify.constants import NODE_INSTANCE
 
+from cloudify_starlingx_sdk.common import connection_registry
+
+from ..utils import (
+    deployment_cache,
+    rest_client_pool,
+    intrinsic_function_cache)
+
 
 class StarlingXTestBase(unittest.TestCase):
 
     def setUp(self):
         super(StarlingXTestBase, self).setUp()
+        connection_registry.clear()
+        rest_client_pool.clear()
+        intrinsic_function_cache.clear()
+        deployment_cache.clear()
 
     def get_mock_ctx(self, node_name='foo', reltype=NODE_INSTANCE):
         ctx = unittest.mock.MagicMock()
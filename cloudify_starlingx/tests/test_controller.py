@@ -13,14 +13,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from unittest.mock import patch
+import time
+from types import SimpleNamespace
+from unittest.mock import patch, Mock, MagicMock
 
 from cloudify.state import current_ctx
 from cloudify.constants import NODE_INSTANCE
 from cloudify.exceptions import NonRecoverableError
 
 from . import StarlingXTestBase
-from ..resources.wrcp import poststart
+from ..resources.wrcp import poststart, get_application_inventory
 
 
 class StarlingXControllerTest(StarlingXTestBase):
@@ -73,3 +75,51 @@ class StarlingXControllerTest(StarlingXTestBase):
                 )
             )
         )
+
+    def test_get_application_inventory(self):
+        resource = Mock(resource_id='foo')
+        resource.get_application_inventory.return_value = {
+            'cert-manager': {'app_version': '1.0-15', 'status': 'applied'}}
+        self.assertEqual(get_application_inventory(resource),
+                         resource.get_application_inventory.return_value)
+        # A failure of the app list does not fail the install.
+        resource.get_application_inventory.side_effect = Exception('foo')
+        self.assertEqual(get_application_inventory(resource), {})
+        resource.logger.error.assert_called_once()
+
+    @patch('cloudify_starlingx.resources.wrcp.get_parent_wrcp_ip',
+           return_value='')
+    @patch('cloudify_starlingx_sdk.resources.configuration.get_client')
+    @patch('cloudify_starlingx.utils.get_rest_client')
+    @patch('cloudify_starlingx.utils.format_location_name')
+    def test_poststart_concurrent_reads(self, _, __, get_client, ___):
+        connection = MagicMock()
+        connection.isystem.get.side_effect = lambda uuid: SimpleNamespace(
+            name='bar',
+            description='',
+            location='',
+            latitude='',
+            longitude='',
+            system_type='standard',
+            system_mode='simplex',
+            distributed_cloud_role='subcloud',
+            region_name='subcloud1')
+
+        def slow_get_client(**_):
+            # Give the threads time to race for the lazy attributes.
+            time.sleep(0.05)
+            return connection
+        get_client.side_effect = slow_get_client
+        ctx = self.get_mock_ctx(reltype=NODE_INSTANCE)
+        ctx.node.properties['resource_config'] = {'uuid': 'foo'}
+        ctx.node.properties['client_config']['auth_url'] = \
+            'https://example.com:5000/v3'
+        current_ctx.set(ctx=ctx)
+        poststart(ctx=ctx)
+        self.assertEqual(get_client.call_count, 1)
+        self.assertEqual(connection.isystem.get.call_count, 1)
+        # The subcloud lookup without a parent IP is not done again.
+        parent_ip_errors = [
+            c for c in ctx.logger.error.mock_calls
+            if 'Parent IP' in str(c)]
+        self.assertEqual(len(parent_ip_errors), 1)
@@ -41,6 +41,18 @@ class StarlingXUtilsTest(StarlingXTestBase):
         self.assertIs(ctx, utils.resolve_ctx(ctx))
         self.assertIsNot(ctx, utils.resolve_ctx(ctx2))
 
+    def test_run_concurrently(self):
+        ctx = self.get_mock_ctx()
+        results = utils.run_concurrently(
+            {'foo': lambda: current_ctx.get_ctx(), 'bar': lambda: 'bar'},
+            ctx)
+        self.assertEqual(results, {'foo': ctx, 'bar': 'bar'})
+
+        def fail():
+            raise NonRecoverableError('foo')
+        with self.assertRaises(NonRecoverableError):
+            utils.run_concurrently({'foo': fail, 'bar': lambda: 'bar'}, ctx)
+
     def test_update_prop_resource(self):
         r = Mock()
         to_dict = {'baz': 'baz', 'bar': 'bar'}
@@ -53,6 +65,27 @@ class StarlingXUtilsTest(StarlingXTestBase):
         utils.update_prop_resources(ctx.instance, [r], 'foo')
         assert 'foo' in ctx.instance.runtime_properties
         assert ctx.instance.runtime_properties['foo'] == to_dict
+        utils.update_prop_resources(ctx.instance, [r], 'foo', ['baz'])
+        r.to_dict.assert_called_with(fields=['baz'])
+
+    def test_batched_runtime_properties(self):
+        r = Mock()
+        r.to_dict.return_value = {'baz': 'baz'}
+        ctx = self.get_mock_ctx('foo')
+        ctx.instance.runtime_properties['bar'] = 'bar'
+        with patch.object(ctx.instance, 'update') as update:
+            with utils.batched_runtime_properties(ctx.instance) as batch:
+                utils.update_prop_resources(ctx.instance, [r, r], 'foo')
+                update.assert_not_called()
+                self.assertEqual(batch.changed_keys(), ['foo'])
+                self.assertEqual(
+                    utils.flush_runtime_properties(ctx.instance), ['foo'])
+                self.assertEqual(update.call_count, 1)
+                # Nothing changed since the checkpoint.
+                utils.update_prop_resource(ctx.instance, r, 'foo')
+            self.assertEqual(update.call_count, 1)
+            utils.update_prop_resource(ctx.instance, r, 'foo')
+            self.assertEqual(update.call_count, 2)
 
     def test_kubernetes_openstack_props(self):
         k = Mock()
@@ -82,6 +115,30 @@ class StarlingXUtilsTest(StarlingXTestBase):
             return kwargs
         self.assertIn('rest_client', mock_function())
 
+    @patch('cloudify_starlingx.utils.get_execution_token', return_value=None)
+    @patch('cloudify_starlingx.utils.get_tenant_name')
+    @patch('cloudify_starlingx.utils.get_execution_id')
+    @patch('cloudify_starlingx.utils.get_rest_client')
+    def test_rest_client_pool(self, mock_client, execution_id, tenant, _):
+        mock_client.side_effect = lambda: Mock()
+        pool = utils.RestClientPool(max_size=2)
+        execution_id.return_value = 'foo'
+        tenant.return_value = 'default_tenant'
+        client = pool.get()
+        self.assertIs(client, pool.get())
+        tenant.return_value = 'other_tenant'
+        self.assertIsNot(client, pool.get())
+        execution_id.return_value = 'bar'
+        pool.get()
+        # The least recently used client was dropped.
+        execution_id.return_value = 'foo'
+        tenant.return_value = 'default_tenant'
+        self.assertIsNot(client, pool.get())
+        # Without an execution, every call gets a new client.
+        execution_id.return_value = None
+        self.assertIsNot(pool.get(), pool.get())
+        self.assertEqual(mock_client.call_count, 6)
+
     @patch('cloudify_starlingx.utils.wtx')
     @patch('cloudify_starlingx.utils.get_rest_client')
     def test_get_instances_of_nodes(self, mock_client, mock_ctx):
@@ -110,6 +167,28 @@ class StarlingXUtilsTest(StarlingXTestBase):
                        'node_id'],
             deployment_id='bar', state='started') in mock_client.mock_calls
 
+    @patch('cloudify_starlingx.utils.get_rest_client')
+    def test_get_node_instances_by_type_index(self, mock_client):
+        nodes = [Mock(id='foo', type_hierarchy=['a', utils.CONTROLLER_TYPE]),
+                 Mock(id='bar', type_hierarchy=['a'])]
+        instances = [Mock(node_id=node_id)
+                     for node_id in ['foo', 'bar', 'foo', 'bar']]
+        rest_client = mock_client.return_value
+        rest_client.nodes.list.return_value = nodes
+        rest_client.node_instances.list.return_value = instances
+        index = utils.get_node_type_index(deployment_id='baz')
+        self.assertEqual(
+            utils.get_node_instances_by_type(
+                node_type=utils.CONTROLLER_TYPE,
+                deployment_id='baz',
+                node_type_index=index),
+            [instances[0], instances[2]])
+        utils.get_node_instances_by_type(
+            node_type='a', deployment_id='baz', node_type_index=index)
+        rest_client.nodes.list.assert_called_once_with(
+            deployment_id='baz', _includes=['id', 'type_hierarchy'])
+        rest_client.nodes.get.assert_not_called()
+
     @patch('cloudify_starlingx.utils.get_rest_client')
     def update_runtime_properties(self, mock_client):
         instance = Mock(id='foo', state=0)
@@ -125,6 +204,37 @@ class StarlingXUtilsTest(StarlingXTestBase):
             {'foo': 'taco', resource.resource_id: resource.to_dict()},
             1) in mock_client.mock_calls
 
+    @patch('cloudify_starlingx.utils.get_rest_client')
+    def test_update_runtime_properties_chunks(self, mock_client):
+        mock_client.return_value.node_instances.update.return_value = \
+            Mock(version=2)
+        instance = Mock(id='foo', state='started', version=1)
+        instance.runtime_properties = {'foo': {'1': {'removed': False}}}
+
+        def get_resources():
+            for resource_id in range(2, 7):
+                resource = Mock(resource_id=resource_id)
+                resource.to_dict.return_value = {
+                    str(resource_id): {'name': resource_id}}
+                yield resource
+
+        count = utils.update_runtime_properties(
+            instance=instance,
+            resources=get_resources(),
+            prop_name='foo',
+            removed=['1'],
+            chunk_size=2)
+        self.assertEqual(count, 5)
+        updates = mock_client.return_value.node_instances.update.mock_calls
+        self.assertEqual(len(updates), 3)
+        self.assertEqual(
+            [update.kwargs['version'] for update in updates], [1, 2, 2])
+        self.assertEqual(
+            sorted(updates[-1].kwargs['runtime_properties']['foo']),
+            ['1', '2', '3', '4', '5', '6'])
+        self.assertTrue(
+            updates[-1].kwargs['runtime_properties']['foo']['1']['removed'])
+
     def test_desecretize_client_config(self):
         expected = {'foo': 'bar'}
         result = utils.desecretize_client_config(expected)
@@ -145,6 +255,66 @@ class StarlingXUtilsTest(StarlingXTestBase):
         utils.get_secret(secret_name=prop)
         assert call().secrets.get('bar') in mock_client.mock_calls
 
+    @patch('cloudify_starlingx.utils.wtx')
+    @patch('cloudify_starlingx.utils.get_execution_token', return_value=None)
+    @patch('cloudify_starlingx.utils.get_tenant_name',
+           return_value='default_tenant')
+    @patch('cloudify_starlingx.utils.get_execution_id', return_value='foo')
+    @patch('cloudify_starlingx.utils.get_rest_client')
+    def test_intrinsic_function_cache(self, mock_client, *_):
+        rest_client = mock_client.return_value
+        rest_client.secrets.get.return_value = Mock(value='secret')
+        rest_client.deployments.get.return_value = Mock(
+            inputs={'user': 'admin', 'region': 'RegionOne'})
+        config = {'password': {'get_secret': 'bar'},
+                  'username': {'get_input': 'user'},
+                  'region_name': {'get_input': 'region'}}
+        for _ in range(3):
+            self.assertEqual(
+                utils.desecretize_client_config(dict(config)),
+                {'password': 'secret',
+                 'username': 'admin',
+                 'region_name': 'RegionOne'})
+        self.assertEqual(rest_client.secrets.get.call_count, 1)
+        self.assertEqual(rest_client.deployments.get.call_count, 1)
+        self.assertNotIn('secret', repr(utils.intrinsic_function_cache))
+        utils.intrinsic_function_cache.invalidate('secret', 'bar')
+        utils.get_secret('bar')
+        self.assertEqual(rest_client.secrets.get.call_count, 2)
+        self.assertEqual(rest_client.deployments.get.call_count, 1)
+
+    @patch('cloudify_starlingx.utils.ctx')
+    @patch('cloudify_starlingx.utils.get_execution_token', return_value=None)
+    @patch('cloudify_starlingx.utils.get_tenant_name',
+           return_value='default_tenant')
+    @patch('cloudify_starlingx.utils.get_execution_id', return_value='foo')
+    @patch('cloudify_starlingx.utils.get_rest_client')
+    def test_deployment_snapshot(self, mock_client, *_):
+        rest_client = mock_client.return_value
+        rest_client.deployments.get.return_value = Mock(
+            id='baz', labels=[{'key': 'foo', 'value': 'bar'}], site_name='')
+
+        def update_labels(deployment_id, labels):
+            return Mock(id=deployment_id,
+                        labels=[{'key': k, 'value': v}
+                                for label in labels
+                                for k, v in label.items()],
+                        site_name='')
+        rest_client.deployments.update_labels.side_effect = update_labels
+        utils.add_new_label('qux', 'quux', 'baz')
+        self.assertEqual(utils.get_deployment_label_by_name('qux', 'baz'),
+                         'quux')
+        self.assertEqual(utils.get_deployment_label_by_name('foo', 'baz'),
+                         'bar')
+        utils.update_deployment_site('baz', 'site')
+        rest_client.deployments.set_site.assert_called_once_with(
+            'baz', 'site')
+        # The deployment was read once, and refreshed by the label update.
+        self.assertEqual(rest_client.deployments.get.call_count, 1)
+        # The site update returned no deployment, so it is read again.
+        utils.get_deployment_labels('baz')
+        self.assertEqual(rest_client.deployments.get.call_count, 2)
+
     @patch('cloudify_starlingx.utils.get_rest_client')
     def test_create_deployment(self, mock_client):
         prop = {
@@ -16,9 +16,10 @@
 from cloudify.state import current_ctx
 from cloudify.constants import NODE_INSTANCE
 
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
-from ..workflows import discover
+from ..workflows import discover, inventory
 from ..utils import CONTROLLER_TYPE
 from . import StarlingXTestBase
 
@@ -90,7 +91,9 @@ class StarlingXWorkflowTest(StarlingXTestBase):
         current_ctx.set(ctx)
         with patch('cloudify_starlingx.utils.wtx', side_effect=ctx):
             discover.discover_subclouds(ctx=ctx)
-        assert mock_rest_client.nodes.get.called
+        # The node types are listed once, not fetched per node instance.
+        assert mock_rest_client.nodes.list.called
+        assert not mock_rest_client.nodes.get.called
         assert mock_rest_client.node_instances.list.called
 
     @patch('cloudify_starlingx.utils.get_rest_client')
@@ -116,3 +119,41 @@ class StarlingXWorkflowTest(StarlingXTestBase):
                        return_value=node):
                 discover.discover_and_deploy(ctx=ctx)
         assert mock_rest_client.deployment_groups.put.called
+
+    @patch('cloudify_starlingx.utils.get_rest_client')
+    @patch('cloudify_starlingx_sdk.resources.configuration.get_client')
+    def test_collect_application_inventory(self, get_client, get_rest_client):
+        mock_rest_client = self.get_mock_rest_client()
+        get_rest_client.return_value = mock_rest_client
+        get_client.return_value.app.list.return_value = [
+            SimpleNamespace(name='platform-integ-apps',
+                            app_version='1.0-8',
+                            status='applied')]
+        node_instance = mock_rest_client.node_instances.list()[0]
+        node_instance.runtime_properties['subclouds']['subcloud3'] = {
+            'external_id': 'scIII',
+            'name': 'sc3',
+            'oam_floating_ip': 'fd00::3',
+            'removed': True
+        }
+        node = mock_rest_client.nodes.list()[0]
+        node.properties['client_config']['auth_url'] = \
+            'http://10.10.10.10:5000/v3'
+        ctx = self.get_mock_ctx('foo', reltype=NODE_INSTANCE)
+        ctx.get_node = MagicMock(return_value=node)
+        current_ctx.set(ctx)
+        with patch('cloudify_starlingx.workflows.inventory'
+                   '.get_controller_node_instance',
+                   return_value=node_instance):
+            inventory.collect_application_inventory(ctx=ctx)
+        # One app list for the one subcloud that was not removed.
+        self.assertEqual(get_client.return_value.app.list.call_count, 1)
+        self.assertEqual(get_client.call_args[1]['os_auth_url'],
+                         'http://10.10.10.11:5000/v3')
+        self.assertEqual(get_client.call_args[1]['os_region_name'], 'sc2')
+        props = mock_rest_client.node_instances.update.call_args[1][
+            'runtime_properties']
+        self.assertEqual(props['subcloud_applications'],
+                         {'sc2': {'platform-integ-apps': {
+                             'app_version': '1.0-8',
+                             'status': 'applied'}}})
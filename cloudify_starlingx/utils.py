@@ -20,15 +20,26 @@ import base64
 import asyncio
 from time import sleep
 from copy import deepcopy
+from threading import Lock
 from tempfile import mkstemp
-from urllib.parse import urlparse
+from collections import OrderedDict
+from contextlib import contextmanager
+from urllib.parse import urlparse, urlunparse
 from ipaddress import ip_address, IPv4Address
+from concurrent.futures import ThreadPoolExecutor
 
+import requests
+from requests.adapters import HTTPAdapter
 from cloudify import ctx
+from cloudify.state import current_ctx
 from cloudify.workflows import ctx as wtx
 from cloudify.manager import get_rest_client
 from cloudify.exceptions import NonRecoverableError
-from cloudify.utils import exception_to_error_cause
+from cloudify.utils import (
+    get_tenant_name,
+    get_execution_id,
+    get_execution_token,
+    exception_to_error_cause)
 from dcmanagerclient.exceptions import APIException
 from cloudify_rest_client.exceptions import (
     CloudifyClientError,
@@ -38,6 +49,11 @@ from cloudify.constants import NODE_INSTANCE, RELATIONSHIP_INSTANCE
 
 from cloudify_starlingx_sdk.resources.configuration import SystemResource
 
+from .constants import (
+    EXECUTION_CACHE_SIZE,
+    REST_CLIENT_POOL_SIZE,
+    REST_CLIENT_MAX_CONNECTIONS)
+
 CONTROLLER_TYPE = 'cloudify.nodes.starlingx.WRCP'
 
 
@@ -48,6 +64,29 @@ def background(f):
     return wrapped
 
 
+def run_concurrently(calls, _ctx, max_workers=None):
+    """ Call independent functions in a bounded thread pool. Every thread
+    runs with the operation context, so the functions may use ctx and the
+    REST client.
+
+    :param calls: A dict of name to function without arguments.
+    :param _ctx: The current cloudify context object.
+    :param max_workers: The number of functions to call at the same time.
+    :return dict: The name of every function to its result. If a function
+      raised an exception, it is raised here.
+    """
+
+    def call(func):
+        with current_ctx.push(_ctx):
+            return func()
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(calls) or 1) \
+            as executor:
+        futures = {name: executor.submit(call, func)
+                   for name, func in calls.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
 def resolve_node_ctx_from_relationship(_ctx):
     """
     This method is to decide where to get node from relationship context
@@ -92,17 +131,115 @@ def resolve_ctx(_ctx):
     return _ctx
 
 
-def update_prop_resource(ctx_instance, resource, config_key=None):
+def resource_to_dict(resource, fields=None):
+    """ Serialize a resource, with only the given fields if there are any.
+    """
+    if fields is None:
+        return resource.to_dict()
+    return resource.to_dict(fields=fields)
+
+
+class RuntimePropertiesBatch(object):
+    """Collects the runtime property changes of a node instance, so that
+    they are stored with one update when the batch is flushed, instead of
+    one update per change. A flush only updates the node instance if some
+    keys changed since the properties were loaded or last flushed.
+    """
+
+    def __init__(self, ctx_instance):
+        self.ctx_instance = ctx_instance
+        self.snapshot = deepcopy(dict(ctx_instance.runtime_properties))
+
+    def changed_keys(self):
+        props = self.ctx_instance.runtime_properties
+        return sorted(
+            key for key in set(props) | set(self.snapshot)
+            if key not in props or key not in self.snapshot or
+            props[key] != self.snapshot[key])
+
+    def flush(self):
+        """ Store the runtime properties, if any keys changed.
+
+        :return list: The keys that changed.
+        """
+        changed_keys = self.changed_keys()
+        if changed_keys:
+            # Copy before the update, because reading the properties after
+            # it gets the node instance again.
+            snapshot = deepcopy(dict(self.ctx_instance.runtime_properties))
+            self.ctx_instance.update()
+            self.snapshot = snapshot
+        return changed_keys
+
+
+# Node instance ID to its active RuntimePropertiesBatch.
+_runtime_properties_batches = {}
+_runtime_properties_batches_lock = Lock()
+
+
+@contextmanager
+def batched_runtime_properties(ctx_instance):
+    """ Defer the runtime property updates of store_runtime_properties
+    until the end of the block, or until flush_runtime_properties is called.
+    If the block raises, the batch does not flush, but the operation
+    dispatcher still stores the pending changes when the operation ends.
+
+    :param ctx_instance: The node instance context.
+    :return: RuntimePropertiesBatch
+    """
+    batch = RuntimePropertiesBatch(ctx_instance)
+    with _runtime_properties_batches_lock:
+        _runtime_properties_batches[ctx_instance.id] = batch
+    try:
+        yield batch
+        batch.flush()
+    finally:
+        with _runtime_properties_batches_lock:
+            _runtime_properties_batches.pop(ctx_instance.id, None)
+
+
+def store_runtime_properties(ctx_instance):
+    """ Update the node instance, unless its runtime property updates are
+    batched, in which case the batch stores them later.
+    """
+    if ctx_instance.id not in _runtime_properties_batches:
+        ctx_instance.update()
+
+
+def flush_runtime_properties(ctx_instance):
+    """ A checkpoint: store the pending runtime property changes now.
+    """
+    batch = _runtime_properties_batches.get(ctx_instance.id)
+    if batch:
+        return batch.flush()
+    ctx_instance.update()
+
+
+def update_prop_resource(ctx_instance,
+                         resource,
+                         config_key=None,
+                         fields=None):
+    update_prop_values(
+        ctx_instance, resource_to_dict(resource, fields), config_key)
+
+
+def update_prop_values(ctx_instance, values, config_key=None):
+    """ Like update_prop_resource, with a resource that is already
+    serialized.
+    """
     config_key = config_key or 'resource_config'
     resource_config = ctx_instance.runtime_properties.get(config_key, {})
-    resource_config.update(resource.to_dict())
+    resource_config.update(values)
     ctx_instance.runtime_properties[config_key] = resource_config
-    ctx_instance.update()
+    store_runtime_properties(ctx_instance)
 
 
-def update_prop_resources(ctx_instance, resources, config_key=None):
+def update_prop_resources(ctx_instance,
+                          resources,
+                          config_key=None,
+                          fields=None):
     for resource in resources:
-        update_prop_resource(ctx_instance, resource, config_key)
+        update_prop_resource(ctx_instance, resource, config_key, fields)
 
 
 def update_kubernetes_props(ctx_instance, resources):
@@ -177,9 +314,10 @@ def get_subcloud_group_id_and_name(ctx_instance):
     return ('null', 'null')
 
 
-def assign_required_labels(ctx_instance, deployment_id):
+def assign_required_labels(ctx_instance, deployment_id, extra_labels=None):
 
     labels = get_deployment_labels(deployment_id)
+    labels.update(extra_labels or {})
     config = ctx_instance.runtime_properties.get('resource_config', {})
     group_id, group_name = get_subcloud_group_id_and_name(ctx.instance)
 
@@ -220,6 +358,146 @@ def get_parent_deployment_capabilities(deployment_id=None, deployment=None):
     return caps
 
 
+def get_execution_key():
+    """ Identify the current execution, its tenant and its token.
+
+    :return tuple: Or None, if there is no execution.
+    """
+    try:
+        execution_id = get_execution_id()
+        if execution_id:
+            return execution_id, get_tenant_name(), get_execution_token()
+    except RuntimeError:
+        # There is no context.
+        pass
+
+
+class RestClientPool(object):
+    """Keeps one manager REST client per execution and tenant, so that all
+    the helpers of an operation or workflow share its HTTP session, instead
+    of each creating a client and connecting to the manager again.
+    A client is created on first use. Its session keeps up to
+    max_connections connections, so that concurrent threads can share it.
+    At most max_size clients are kept, and the least recently used client
+    is dropped first.
+    """
+
+    def __init__(self,
+                 max_size=REST_CLIENT_POOL_SIZE,
+                 max_connections=REST_CLIENT_MAX_CONNECTIONS):
+        self.max_size = max_size
+        self.max_connections = max_connections
+        self._clients = OrderedDict()
+        self._lock = Lock()
+
+    def mount_adapter(self, client):
+        session = getattr(getattr(client, '_client', None), '_session', None)
+        if isinstance(session, requests.Session):
+            adapter = HTTPAdapter(pool_connections=self.max_connections,
+                                  pool_maxsize=self.max_connections)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+
+    def get(self):
+        key = get_execution_key()
+        if key is None:
+            return get_rest_client()
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                return client
+            client = get_rest_client()
+            self.mount_adapter(client)
+            self._clients[key] = client
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+            return client
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+
+rest_client_pool = RestClientPool()
+
+
+class ExecutionCache(object):
+    """Keeps the values that an execution resolves from the manager, e.g.
+    secrets and deployment inputs, so that they are fetched once per
+    execution, and not every time they are resolved.
+    Values are keyed by kind and name, and only kept in memory, per
+    execution and tenant. They are never written to disk or logged, and the
+    cache does not show them in its repr. At most max_size executions are
+    kept. Outside of an execution, nothing is cached.
+    """
+
+    def __init__(self, max_size=EXECUTION_CACHE_SIZE):
+        self.max_size = max_size
+        self._executions = OrderedDict()
+        self._lock = Lock()
+
+    def __repr__(self):
+        return '<{0}: {1} executions>'.format(
+            self.__class__.__name__, len(self._executions))
+
+    def get(self, kind, name, factory):
+        """ Get a value of the current execution, and call factory to get
+        it from the manager the first time.
+        """
+        key = get_execution_key()
+        if key is None:
+            return factory()
+        with self._lock:
+            values = self._executions.get(key)
+            if values is not None:
+                self._executions.move_to_end(key)
+                if (kind, name) in values:
+                    return values[(kind, name)]
+        value = factory()
+        self.set(kind, name, value)
+        return value
+
+    def set(self, kind, name, value):
+        """ Replace a value of the current execution, e.g. after a write.
+        """
+        key = get_execution_key()
+        if key is None:
+            return
+        with self._lock:
+            self._executions.setdefault(key, {})[(kind, name)] = value
+            self._executions.move_to_end(key)
+            while len(self._executions) > self.max_size:
+                self._executions.popitem(last=False)
+
+    def invalidate(self, kind=None, name=None):
+        """ Forget values of the current execution, so that they are fetched
+        again, e.g. after a secret was updated.
+
+        :param kind: Only values of this kind, e.g. secret. By default all.
+        :param name: Only the value with this name.
+        """
+        key = get_execution_key()
+        with self._lock:
+            values = self._executions.get(key, {})
+            for kind_name in list(values):
+                if kind is not None and kind_name[0] != kind:
+                    continue
+                if name is not None and kind_name[1] != name:
+                    continue
+                del values[kind_name]
+
+    def clear(self):
+        with self._lock:
+            self._executions.clear()
+
+
+intrinsic_function_cache = ExecutionCache()
+# Snapshots of deployments, which are read by the label, site and parent
+# helpers, and refreshed by their writes. See with_starlingx_resource.
+deployment_cache = ExecutionCache()
+
+
 def with_rest_client(func):
     """
     :param func: This is a class for the starlingx resource need to be
@@ -228,17 +506,21 @@ def with_rest_client(func):
     """
 
     def wrapper_inner(*args, **kwargs):
-        kwargs['rest_client'] = get_rest_client()
+        kwargs['rest_client'] = rest_client_pool.get()
         return func(*args, **kwargs)
     return wrapper_inner
 
 
-def get_instances_of_nodes(node_id=None, node_type=None, deployment_id=None):
+def get_instances_of_nodes(node_id=None,
+                           node_type=None,
+                           deployment_id=None,
+                           node_type_index=None):
     """ Get instances of nodes either by node ID or node type.
 
     :param node_id: The node ID to filter.
     :param node_type: The node type to filter.
     :param deployment_id: The ID of a deployment node.
+    :param node_type_index: A result of get_node_type_index to reuse.
     :return list: A list of node instances.
     """
     if node_id:
@@ -246,7 +528,9 @@ def get_instances_of_nodes(node_id=None, node_type=None, deployment_id=None):
         return controller_node.instances
     elif node_type:
         return get_node_instances_by_type(
-            node_type=node_type, deployment_id=deployment_id)
+            node_type=node_type,
+            deployment_id=deployment_id,
+            node_type_index=node_type_index)
     else:
         raise NonRecoverableError('No node_id and no node_type provided.')
 
@@ -271,45 +555,82 @@ def update_site(site_name, location, rest_client):
 
 @with_rest_client
 def update_deployment_site(deployment_id, site_name, rest_client):
-    deployment = get_deployment(deployment_id)
+    deployment = get_deployment_snapshot(deployment_id)
     if deployment.site_name == site_name:
         return deployment
     elif deployment.site_name:
-        return rest_client.deployments.set_site(
+        deployment = rest_client.deployments.set_site(
             deployment_id, detach_site=True)
-    return rest_client.deployments.set_site(
-        deployment_id, site_name)
+    else:
+        deployment = rest_client.deployments.set_site(
+            deployment_id, site_name)
+    refresh_deployment_snapshot(deployment_id, deployment)
+    return deployment
+
+
+@with_rest_client
+def get_node_type_index(deployment_id, rest_client):
+    """ Map the ID of every node in a deployment to its type hierarchy,
+    with one nodes list call.
+
+    :param deployment_id: The deployment ID.
+    :param rest_client: The rest client.
+    :return dict: node ID to a list of types.
+    """
+    return {
+        node.id: node.type_hierarchy for node in rest_client.nodes.list(
+            deployment_id=deployment_id, _includes=['id', 'type_hierarchy'])
+    }
+
+
+def get_node_ids_by_type(node_type, deployment_id, node_type_index=None):
+    """ Get the IDs of the nodes of a type, in the order of the nodes list.
+
+    :param node_type: the node type that we wish to filter.
+    :param deployment_id: The deployment ID.
+    :param node_type_index: A result of get_node_type_index to reuse.
+    :return list: a list of node IDs.
+    """
+    if node_type_index is None:
+        node_type_index = get_node_type_index(deployment_id)
+    return [node_id for node_id, type_hierarchy in node_type_index.items()
+            if node_type in type_hierarchy]
 
 
 @with_rest_client
 def get_controller_node(deployment_id, rest_client=None):
     """Get nodes by node type. There should be one.
 
-    :param node_type:
     :param deployment_id:
     :param rest_client:
     :return:
     """
-    nodes = []
     for node in rest_client.nodes.list(deployment_id=deployment_id,
-                                       _includes=['properties']):
+                                       _includes=['id',
+                                                  'type_hierarchy',
+                                                  'properties']):
         if CONTROLLER_TYPE in node.type_hierarchy:
-            nodes.append(node)
-    if nodes:
-        return nodes[0]
+            return node
     raise NonRecoverableError(
         'No nodes of type {t} were found.'.format(t=CONTROLLER_TYPE))
 
 
 @with_rest_client
-def get_node_instances_by_type(node_type, deployment_id, rest_client):
-    """Filter node instances by type.
+def get_node_instances_by_type(node_type,
+                               deployment_id,
+                               rest_client,
+                               node_type_index=None):
+    """Filter node instances by type. The types of the nodes are listed
+    once, not fetched per node instance.
 
     :param rest_client: The rest client.
     :param node_type: the node type that we wish to filter.
     :param deployment_id: The deployment ID.
+    :param node_type_index: A result of get_node_type_index to reuse.
     :return list: a list of node instances.
     """
+    node_ids = set(get_node_ids_by_type(
+        node_type, deployment_id, node_type_index))
     node_instances = []
     for ni in rest_client.node_instances.list(deployment_id=deployment_id,
                                               state='started',
@@ -318,9 +639,7 @@ def get_node_instances_by_type(node_type, deployment_id, rest_client):
                                                          'version',
                                                          'runtime_properties',
                                                          'node_id']):
-        node = rest_client.nodes.get(
-            node_id=ni.node_id, deployment_id=deployment_id)
-        if node_type in node.type_hierarchy:
+        if ni.node_id in node_ids:
             node_instances.append(ni)
     return node_instances
 
@@ -329,22 +648,39 @@ def get_node_instances_by_type(node_type, deployment_id, rest_client):
 def update_runtime_properties(instance,
                               resources,
                               prop_name,
-                              rest_client):
+                              rest_client,
+                              overwrite=False,
+                              removed=None,
+                              chunk_size=None,
+                              fields=None):
     """
 
     :param instance: The node instance to update.
-    :param resources: A list of resources to pull.
+    :param resources: A list or generator of resources to pull.
     :param prop_name: The property on the instance to update.
     :param rest_client: The rest client.
-    :return:
+    :param overwrite: Whether to replace resources already in the property.
+    :param removed: A list of IDs in the property to mark as removed.
+    :param chunk_size: Store the property every chunk_size resources,
+      instead of only once at the end.
+    :param fields: Only store these fields of every resource.
+    :return int: The number of resources that were added to the property.
     """
 
     props = deepcopy(instance.runtime_properties)
     prop = props.get(prop_name, {})
+    props[prop_name] = prop
+    instance_version = int(instance.version)
+    count = 0
+    pending = 0
+    for resource_id in removed or []:
+        if resource_id in prop:
+            prop[resource_id]['removed'] = True
+            pending += 1
     for resource in resources:
-        if resource.resource_id not in prop:
+        if overwrite or resource.resource_id not in prop:
             try:
-                prop.update(**resource.to_dict())
+                prop.update(**resource_to_dict(resource, fields))
             except Exception:  # noqa
                 try:
                     ctx.logger.error(
@@ -356,12 +692,24 @@ def update_runtime_properties(instance,
                         'Failed to get details of subcloud {}. '
                         'Skipping...'.format(resource.resource_id))
                     continue
-    props[prop_name] = prop
-    instance_version = int(instance.version)
-    rest_client.node_instances.update(node_instance_id=instance.id,
-                                      state=instance.state,
-                                      runtime_properties=props,
-                                      version=instance_version)
+            count += 1
+            pending += 1
+        if chunk_size and pending >= chunk_size:
+            instance_version = _update_node_instance(
+                rest_client, instance, props, instance_version)
+            pending = 0
+    if pending:
+        _update_node_instance(rest_client, instance, props, instance_version)
+    return count
+
+
+def _update_node_instance(rest_client, instance, props, instance_version):
+    node_instance = rest_client.node_instances.update(
+        node_instance_id=instance.id,
+        state=instance.state,
+        runtime_properties=props,
+        version=instance_version)
+    return int(node_instance.version)
 
 
 def desecretize_client_config(config):
@@ -394,8 +742,10 @@ def resolve_intrinsic_functions(prop, dep_id=None):
 
 @with_rest_client
 def get_secret(secret_name, rest_client):
-    secret = rest_client.secrets.get(secret_name)
-    return secret.value
+    return intrinsic_function_cache.get(
+        'secret',
+        secret_name,
+        lambda: rest_client.secrets.get(secret_name).value)
 
 
 def add_new_label(key, value, deployment_id):
@@ -421,7 +771,7 @@ def convert_dict_to_list(labels):
 
 
 def get_deployment_labels(deployment_id):
-    deployment = get_deployment(deployment_id)
+    deployment = get_deployment_snapshot(deployment_id)
     return convert_list_to_dict(deepcopy(deployment.labels))
 
 
@@ -440,16 +790,20 @@ def get_parent_deployment(deployment_id, rest_client):
             'No "csys-obj-parent" label set for deployment. '
             'Assuming manual subcloud enrollment. Set label manually.')
         return
-    return rest_client.deployments.get(deployment_id)
+    return deployment_cache.get(
+        'deployment',
+        deployment_id,
+        lambda: rest_client.deployments.get(deployment_id))
 
 
 @with_rest_client
 def update_deployment_labels(deployment_id, labels, rest_client):
     labels = convert_dict_to_list(labels)
     ctx.logger.info(labels)
-    rest_client.deployments.update_labels(
+    deployment = rest_client.deployments.update_labels(
         deployment_id,
         labels=labels)
+    refresh_deployment_snapshot(deployment_id, deployment)
 
 
 @with_rest_client
@@ -514,6 +868,7 @@ def create_deployments(group_id,
 
 @with_rest_client
 def get_attribute(node_id, runtime_property, deployment_id, rest_client):
+    # Runtime properties change during an execution, so they are not cached.
     for node_instance in rest_client.node_instances.list(node_id=node_id):
         if node_instance.deployment_id != deployment_id:
             continue
@@ -597,6 +952,35 @@ def get_deployment(deployment_id, rest_client):
         return
 
 
+@with_rest_client
+def get_deployment_snapshot(deployment_id, rest_client):
+    """ Get a deployment once per execution, or once per operation of
+    with_starlingx_resource. Unlike get_deployment, use it only for
+    deployments whose changes go through refresh_deployment_snapshot.
+
+    :param deployment_id: The deployment ID.
+    :param rest_client: The rest client.
+    :return: The deployment, or None if it was not found.
+    """
+    try:
+        return deployment_cache.get(
+            'deployment',
+            deployment_id,
+            lambda: rest_client.deployments.get(deployment_id=deployment_id))
+    except CloudifyClientError:
+        return
+
+
+def refresh_deployment_snapshot(deployment_id, deployment=None):
+    """ Replace the snapshot of a deployment after a write, with the
+    deployment that the write returned. Otherwise, the next read gets it.
+    """
+    if getattr(deployment, 'id', None) == deployment_id:
+        deployment_cache.set('deployment', deployment_id, deployment)
+    else:
+        deployment_cache.invalidate('deployment', deployment_id)
+
+
 @with_rest_client
 def check_if_subcloud_discovered_and_deployed(display_name,
                                               parent_id,
@@ -622,19 +1006,25 @@ def check_if_subcloud_discovered_and_deployed(display_name,
 
 @with_rest_client
 def get_input(input_name, rest_client):
-    deployment = rest_client.deployments.get(wtx.deployment.id)
-    return deployment.inputs.get(input_name)
+    # All the inputs of the deployment come with one deployment get.
+    inputs = intrinsic_function_cache.get(
+        'inputs',
+        wtx.deployment.id,
+        lambda: rest_client.deployments.get(wtx.deployment.id).inputs)
+    return deepcopy(inputs.get(input_name))
 
 
 def get_controller_node_instance(node_instance_id=None,
                                  node_id=None,
-                                 ctx=None):
+                                 ctx=None,
+                                 node_type_index=None):
 
     """Get a node instance of a System Controller.
 
     :param node_instance_id:
     :param node_id:
     :param ctx:
+    :param node_type_index: A result of get_node_type_index to reuse.
     :return:
     """
 
@@ -647,7 +1037,9 @@ def get_controller_node_instance(node_instance_id=None,
         node_instances = controller_node.instances
     else:
         node_instances = get_instances_of_nodes(
-            node_type=CONTROLLER_TYPE, deployment_id=ctx.deployment.id)
+            node_type=CONTROLLER_TYPE,
+            deployment_id=ctx.deployment.id,
+            node_type_index=node_type_index)
 
     controllers = []
     for node_instance in node_instances:
@@ -716,10 +1108,11 @@ def handle_cert_in_config(client_config):
     return cacert, cafile, cafilename
 
 
-def get_system(controller_node):
+def get_system(controller_node, **kwargs):
     """ Get a system object by cloudify node.
 
     :param controller_node: Cloudify node rest API object.
+    :param kwargs: Additional SystemResource parameters, e.g. max_workers.
     :return list: subclouds
     """
     client_config = desecretize_client_config(
@@ -729,7 +1122,8 @@ def get_system(controller_node):
         return cafile, cafilename, SystemResource(
             client_config=client_config,
             resource_config=controller_node.properties.get('resource_config'),
-            logger=wtx.logger
+            logger=wtx.logger,
+            **kwargs
         )
     except APIException as errors:
         _, _, tb = sys.exc_info()
@@ -753,6 +1147,22 @@ def cacert_as_file(cacert):
     return new_file, filename
 
 
+def get_subcloud_auth_url(auth_url, ip):
+    """ Get the keystone URL of a subcloud from its OAM floating IP, with
+    the scheme of the system controller keystone URL.
+
+    :param auth_url: The keystone URL of the system controller.
+    :param ip: The OAM floating IP of the subcloud.
+    :return str: The keystone URL of the subcloud.
+    """
+    scheme = urlparse(auth_url).scheme
+    if is_ipv4_address(ip):
+        netloc = '{ip}:5000'.format(ip=ip)
+    else:
+        netloc = '[{ip}]:5000'.format(ip=ip)
+    return urlunparse((scheme, netloc, '/v3', '', '', ''))
+
+
 def is_ipv4_address(ip):
     if type(ip_address(ip)) is IPv4Address:
         return True
@@ -14,29 +14,41 @@
 # limitations under the License.
 
 import os
-from urllib.parse import urlparse, urlunparse
 
 from cloudify.decorators import workflow
 from cloudify.workflows import ctx as wtx
 from cloudify.exceptions import NonRecoverableError
 
+from cloudify_starlingx_sdk.cache import DiscoveryCache
+
 from ..constants import LABELS
 from ..utils import (
     get_system,
     get_deployment,
-    is_ipv4_address,
+    get_node_type_index,
     create_deployment,
     install_deployment,
     create_deployments,
     install_deployments,
     update_runtime_properties,
+    get_subcloud_auth_url,
     get_controller_node_instance,
     get_parent_deployment_capabilities,
     check_if_subcloud_discovered_and_deployed)
 
 
 @workflow
-def discover_subclouds(node_instance_id=None, node_id=None, ctx=None, **_):
+def discover_subclouds(node_instance_id=None,
+                       node_id=None,
+                       max_workers=None,
+                       subcloud_filter=None,
+                       incremental=False,
+                       chunk_size=None,
+                       use_cache=False,
+                       cache_bypass=False,
+                       ctx=None,
+                       node_type_index=None,
+                       **_):
     """ Discover subclouds of starlingx controllers.
     We either use a hint for a single controller or discover subclouds for
     all nodes in the deployment.  We get the controller objects, then we search
@@ -45,31 +57,71 @@ def discover_subclouds(node_instance_id=None, node_id=None, ctx=None, **_):
 
     :param node_instance_id: The node instance ID to discover on.
     :param node_id: A node ID hint.
+    :param max_workers: The number of subclouds to fetch concurrently.
+    :param subcloud_filter: A dict of subcloud fields, e.g.
+      availability_status, to the list of values that should be discovered.
+    :param incremental: Only fetch details of subclouds that are new or
+      changed since the last discovery, and mark those that were removed
+      or no longer match subcloud_filter.
+    :param chunk_size: Store the discovered subclouds in the runtime
+      properties every chunk_size subclouds.
+    :param use_cache: Read and store subcloud data in the discovery cache.
+    :param cache_bypass: Do not read from the discovery cache, only refresh.
     :param ctx: Cloudify workflo context
+    :param node_type_index: A result of get_node_type_index to reuse.
     :param _: Additional kwargs, which we ignore.
     :return: None
     """
 
-    # Todo: Check and see what needs to be done for rediscover.
     ctx = ctx or wtx
     controller_node_instance = get_controller_node_instance(
-        node_instance_id, node_id, ctx=ctx)
+        node_instance_id, node_id, ctx=ctx, node_type_index=node_type_index)
     if not controller_node_instance:
         ctx.logger.error('No system controller nodes were identified.')
         return False
-    cafile, cafilename, system = get_system(
-        ctx.get_node(controller_node_instance.node_id))
-    if not system.subcloud_resources:
-        ctx.logger.error(
-            'System {s} has no subclouds.'.format(s=system.resource_id))
-    else:
-        update_runtime_properties(
-            instance=controller_node_instance,
-            resources=system.subcloud_resources,
-            prop_name='subclouds')
-    if cafile and cafilename:
-        os.close(cafile)
-        os.remove(cafilename)
+    cache = DiscoveryCache(bypass=cache_bypass) if use_cache else None
+    cafile, cafilename = None, None
+    try:
+        cafile, cafilename, system = get_system(
+            ctx.get_node(controller_node_instance.node_id),
+            max_workers=max_workers,
+            subcloud_filter=subcloud_filter,
+            cache=cache)
+        if incremental:
+            known_subclouds = controller_node_instance.runtime_properties.get(
+                'subclouds', {})
+            subclouds, removed_subclouds = system.get_changed_subclouds(
+                known_subclouds)
+            ctx.logger.info(
+                'Found {c} new or changed and {r} removed subclouds.'.format(
+                    c=len(subclouds), r=len(removed_subclouds)))
+            update_runtime_properties(
+                instance=controller_node_instance,
+                resources=system.iter_subcloud_records(subclouds),
+                prop_name='subclouds',
+                overwrite=True,
+                removed=removed_subclouds,
+                chunk_size=chunk_size)
+        else:
+            discovered = update_runtime_properties(
+                instance=controller_node_instance,
+                resources=system.iter_subcloud_records(),
+                prop_name='subclouds',
+                chunk_size=chunk_size)
+            if not discovered:
+                ctx.logger.error('System {s} has no subclouds.'.format(
+                    s=system.resource_id))
+        if system.subcloud_failures:
+            ctx.logger.error(
+                'Failed to get details of {n} subclouds: {f}'.format(
+                    n=len(system.subcloud_failures),
+                    f=system.subcloud_failures))
+    finally:
+        if cache:
+            cache.close()
+        if cafile and cafilename:
+            os.close(cafile)
+            os.remove(cafilename)
     return True
 
 
@@ -115,6 +167,12 @@ def discover_and_deploy(node_id=None,
                         node_instance_id=None,
                         deployment_id=None,
                         blueprint_id=None,
+                        max_workers=None,
+                        subcloud_filter=None,
+                        incremental=False,
+                        chunk_size=None,
+                        use_cache=False,
+                        cache_bypass=False,
                         ctx=None,
                         **_):
 
@@ -126,16 +184,27 @@ def discover_and_deploy(node_id=None,
 
     ctx = ctx or wtx
     blueprint_id = blueprint_id or ctx.blueprint.id
+    # Both lookups of the controller share one list of the node types.
+    node_type_index = None
+    if not (node_instance_id or node_id):
+        node_type_index = get_node_type_index(ctx.deployment.id)
     discovered_subclouds = discover_subclouds(
         node_instance_id=node_instance_id,
         node_id=node_id,
-        ctx=ctx)
+        max_workers=max_workers,
+        subcloud_filter=subcloud_filter,
+        incremental=incremental,
+        chunk_size=chunk_size,
+        use_cache=use_cache,
+        cache_bypass=cache_bypass,
+        ctx=ctx,
+        node_type_index=node_type_index)
 
     if not discovered_subclouds:
         return
 
     controller_node_instance = get_controller_node_instance(
-        node_instance_id, node_id, ctx=ctx)
+        node_instance_id, node_id, ctx=ctx, node_type_index=node_type_index)
 
     parent_deployment_capabilities = get_parent_deployment_capabilities(
         deployment=get_deployment(ctx.deployment.id))
@@ -149,7 +218,6 @@ def discover_and_deploy(node_id=None,
     wrcp_insecure = parent_deployment_capabilities.get(
         'wrcp-insecure',
         '')
-    scheme, _, __, ___, ____, _____ = urlparse(auth_url)
 
     props = controller_node_instance.runtime_properties
     subclouds = props.get('subclouds', {})
@@ -168,6 +236,9 @@ def discover_and_deploy(node_id=None,
 
     for _, subcloud in subclouds.items():
 
+        if subcloud.get('removed'):
+            continue
+
         subcloud_name = subcloud.get('name')
 
         _deployment_id = deployment_id or generate_deployment_id(subcloud_name)
@@ -179,15 +250,9 @@ def discover_and_deploy(node_id=None,
                     sub=subcloud_name, dep=_deployment_id))
             continue
 
-        # How do we get the system object for the subcloud?
-        ip = subcloud.get('oam_floating_ip')
-        if is_ipv4_address(ip):
-            new_netloc = '{ip}:5000'.format(ip=ip)
-        else:
-            new_netloc = '[{ip}]:5000'.format(ip=ip)
-
         inputs = {
-            'auth_url': urlunparse((scheme, new_netloc, '/v3', '', '', '')),
+            'auth_url': get_subcloud_auth_url(
+                auth_url, subcloud.get('oam_floating_ip')),
             'user_secret': user_secret,
             'password_secret': password_secret,
             'cacert_secret': cacert_secret,
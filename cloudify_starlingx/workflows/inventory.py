@@ -0,0 +1,168 @@
+# #######
+# Copyright (c) 2021 Cloudify Platform Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from copy import deepcopy
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from cloudify.decorators import workflow
+from cloudify.workflows import ctx as wtx
+
+from cloudify_starlingx_sdk.records import InventoryRecord
+from cloudify_starlingx_sdk.constants import DEFAULT_MAX_WORKERS
+from cloudify_starlingx_sdk.resources.configuration import SystemResource
+
+from ..utils import (
+    handle_cert_in_config,
+    get_subcloud_auth_url,
+    update_runtime_properties,
+    desecretize_client_config,
+    get_controller_node_instance)
+
+
+def get_subcloud_system(client_config, subcloud, logger):
+    """ Get a system object of a subcloud, with the credentials of its
+    system controller.
+
+    :param client_config: The client config of the system controller.
+    :param subcloud: A subcloud from the subclouds runtime property.
+    :param logger: A logger.
+    :return: SystemResource
+    """
+    client_config = deepcopy(client_config)
+    client_config['auth_url'] = get_subcloud_auth_url(
+        client_config['auth_url'], subcloud.get('oam_floating_ip'))
+    client_config['region_name'] = subcloud.get('name')
+    return SystemResource(client_config=client_config,
+                          resource_config={'name': subcloud.get('name')},
+                          logger=logger)
+
+
+def get_application_inventory(client_config, subcloud, logger):
+    system = get_subcloud_system(client_config, subcloud, logger)
+    return InventoryRecord(key=subcloud.get('name'),
+                           inventory=system.get_application_inventory())
+
+
+def iter_application_inventories(client_config,
+                                 subclouds,
+                                 logger,
+                                 max_workers=None,
+                                 failures=None):
+    """ Yield the application inventory of every subcloud. Every subcloud
+    is listed with one app list call, and at most max_workers subclouds
+    are listed at the same time.
+
+    :param client_config: The client config of the system controller.
+    :param subclouds: Subclouds from the subclouds runtime property.
+    :param logger: A logger.
+    :param max_workers: The number of subclouds to list concurrently.
+    :param failures: A dict to record the subclouds that failed in.
+    :return: A generator of InventoryRecord.
+    """
+    max_workers = max_workers or DEFAULT_MAX_WORKERS
+    failures = {} if failures is None else failures
+
+    def get_result(subcloud, future):
+        try:
+            return future.result()
+        except Exception as e:
+            failures[subcloud.get('name')] = str(e)
+            logger.error(
+                'Failed to get the applications of subcloud {}: {}. '
+                'Skipping...'.format(subcloud.get('name'), e))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = deque()
+        for subcloud in subclouds:
+            futures.append(
+                (subcloud,
+                 executor.submit(get_application_inventory,
+                                 client_config,
+                                 subcloud,
+                                 logger)))
+            if len(futures) > max_workers:
+                record = get_result(*futures.popleft())
+                if record:
+                    yield record
+        while futures:
+            record = get_result(*futures.popleft())
+            if record:
+                yield record
+
+
+@workflow
+def collect_application_inventory(node_instance_id=None,
+                                  node_id=None,
+                                  max_workers=None,
+                                  chunk_size=None,
+                                  ctx=None,
+                                  **_):
+    """ Collect the applications and their versions on every discovered
+    subcloud of a system controller. We update the controller node instance
+    runtime property subcloud_applications with a dict of subcloud name to
+    {application name: {app_version, status}}.
+
+    :param node_instance_id: The node instance ID of the system controller.
+    :param node_id: A node ID hint.
+    :param max_workers: The number of subclouds to list concurrently.
+    :param chunk_size: Store the inventories in the runtime properties
+      every chunk_size subclouds.
+    :param ctx: Cloudify workflow context
+    :param _: Additional kwargs, which we ignore.
+    :return: None
+    """
+
+    ctx = ctx or wtx
+    controller_node_instance = get_controller_node_instance(
+        node_instance_id, node_id, ctx=ctx)
+    if not controller_node_instance:
+        ctx.logger.error('No system controller nodes were identified.')
+        return False
+    subclouds = [
+        subcloud for subcloud in
+        controller_node_instance.runtime_properties.get(
+            'subclouds', {}).values()
+        if not subcloud.get('removed')]
+    if not subclouds:
+        ctx.logger.error('No discovered subclouds. '
+                         'Run the discover_subclouds workflow first.')
+        return False
+    controller_node = ctx.get_node(controller_node_instance.node_id)
+    client_config = desecretize_client_config(
+        deepcopy(controller_node.properties.get('client_config', {})))
+    _, cafile, cafilename = handle_cert_in_config(client_config)
+    failures = {}
+    try:
+        update_runtime_properties(
+            instance=controller_node_instance,
+            resources=iter_application_inventories(client_config,
+                                                   subclouds,
+                                                   ctx.logger,
+                                                   max_workers,
+                                                   failures),
+            prop_name='subcloud_applications',
+            overwrite=True,
+            chunk_size=chunk_size)
+    finally:
+        if cafile and cafilename:
+            os.close(cafile)
+            os.remove(cafilename)
+    if failures:
+        ctx.logger.error(
+            'Failed to get the applications of {n} subclouds: {f}'.format(
+                n=len(failures), f=failures))
+    return True
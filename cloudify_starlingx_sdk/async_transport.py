@@ -0,0 +1,229 @@
+# #######
+# Copyright (c) 2021 Cloudify Platform Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ssl
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .common import StarlingXException, StarlingXFatalException
+from .constants import DEFAULT_ASYNC_CONCURRENCY
+from .resources.distributed_cloud import DistributedCloudResource
+
+DCMANAGER = 'dcmanager'
+SYSINV = 'platform'
+# Authenticate again if the token expires sooner than this.
+TOKEN_EXPIRY_MARGIN = timedelta(seconds=60)
+
+
+def parse_expires_at(expires_at):
+    """Parse a keystone expires_at value, e.g. 2021-10-01T10:00:00.000000Z.
+    """
+    for date_format in ['%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ']:
+        try:
+            return datetime.strptime(
+                expires_at, date_format).replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            continue
+
+
+class AsyncStarlingXClient(object):
+    """Asyncio client for the read only dcmanager and sysinv REST calls
+    that discovery uses. All requests share one keystone token and one
+    connection pool, so many requests can be in flight from one thread.
+
+        async with AsyncStarlingXClient(client_config) as client:
+            subclouds = await client.list_subclouds()
+
+    The results are the JSON objects returned by the API.
+    """
+
+    def __init__(self,
+                 client_config,
+                 max_concurrency=DEFAULT_ASYNC_CONCURRENCY,
+                 interface='public',
+                 timeout=60):
+        if not aiohttp:
+            raise StarlingXFatalException(
+                'The aiohttp package is required for the async transport.')
+        # Accept both the dcmanager and the cgtsclient flavor of the config.
+        self.client_config = DistributedCloudResource.cleanup_config(
+            client_config)
+        self.max_concurrency = max_concurrency
+        self.interface = interface
+        self.timeout = timeout
+        self._session = None
+        self._token = None
+        self._expires_at = None
+        self._catalog = []
+        self._auth_lock = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    @property
+    def ssl(self):
+        if self.client_config.get('insecure', False):
+            return False
+        cacert = self.client_config.get('cacert')
+        if cacert:
+            return ssl.create_default_context(cafile=cacert)
+        return None
+
+    async def open(self):
+        if not self._session:
+            self._auth_lock = asyncio.Lock()
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_concurrency, ssl=self.ssl),
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+
+    async def close(self):
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def token_is_valid(self):
+        if not self._token:
+            return False
+        if not self._expires_at:
+            return True
+        return self._expires_at - TOKEN_EXPIRY_MARGIN > \
+            datetime.now(timezone.utc)
+
+    async def authenticate(self, force=False):
+        async with self._auth_lock:
+            if self.token_is_valid and not force:
+                return self._token
+            url = '{0}/auth/tokens'.format(
+                self.client_config['auth_url'].rstrip('/'))
+            body = {
+                'auth': {
+                    'identity': {
+                        'methods': ['password'],
+                        'password': {
+                            'user': {
+                                'name': self.client_config.get('username'),
+                                'domain': {
+                                    'name': self.client_config.get(
+                                        'user_domain_name', 'Default')
+                                },
+                                'password': self.client_config.get(
+                                    'api_key')
+                            }
+                        }
+                    },
+                    'scope': {
+                        'project': {
+                            'name': self.client_config.get('project_name'),
+                            'domain': {
+                                'name': self.client_config.get(
+                                    'project_domain_name', 'Default')
+                            }
+                        }
+                    }
+                }
+            }
+            async with self._session.post(url, json=body) as response:
+                if response.status >= 400:
+                    raise StarlingXFatalException(
+                        'Authentication with {0} failed: {1}'.format(
+                            self.client_config['auth_url'], response.status))
+                token = (await response.json()).get('token', {})
+                self._token = response.headers['X-Subject-Token']
+            self._catalog = token.get('catalog', [])
+            self._expires_at = parse_expires_at(token.get('expires_at'))
+            return self._token
+
+    def get_endpoint(self, service_type):
+        region_name = self.client_config.get('region_name')
+        endpoints = []
+        for service in self._catalog:
+            if service.get('type') != service_type:
+                continue
+            for endpoint in service.get('endpoints', []):
+                if endpoint.get('interface') == self.interface:
+                    endpoints.append(endpoint)
+        for endpoint in endpoints:
+            if endpoint.get('region') == region_name:
+                return endpoint['url'].rstrip('/')
+        if endpoints:
+            return endpoints[0]['url'].rstrip('/')
+        raise StarlingXFatalException(
+            'No {0} endpoint was found in the service catalog.'.format(
+                service_type))
+
+    async def get(self, service_type, path):
+        await self.open()
+        await self.authenticate()
+        for attempt in range(2):
+            url = self.get_endpoint(service_type) + path
+            async with self._session.get(
+                    url, headers={'X-Auth-Token': self._token}) as response:
+                if response.status == 401 and not attempt:
+                    # The token was revoked or expired early.
+                    await self.authenticate(force=True)
+                    continue
+                if response.status >= 400:
+                    raise StarlingXException(
+                        'GET {0} failed: {1} {2}'.format(
+                            url, response.status, await response.text()))
+                return await response.json()
+
+    async def list_subclouds(self):
+        return (await self.get(DCMANAGER, '/subclouds')).get('subclouds', [])
+
+    async def subcloud_additional_details(self, subcloud_id):
+        return await self.get(
+            DCMANAGER, '/subclouds/{0}/detail'.format(subcloud_id))
+
+    async def subclouds_additional_details(self, subcloud_ids):
+        """ Request the details of many subclouds at the same time.
+
+        :param subcloud_ids: A list of subcloud IDs.
+        :return list: The details in the order of subcloud_ids. If a request
+          failed, its exception is returned in its place.
+        """
+        return await asyncio.gather(
+            *[self.subcloud_additional_details(subcloud_id)
+              for subcloud_id in subcloud_ids],
+            return_exceptions=True)
+
+    async def list_subcloud_groups(self):
+        return (await self.get(DCMANAGER, '/subcloud-groups')).get(
+            'subcloud_groups', [])
+
+    async def list_isystems(self):
+        return (await self.get(SYSINV, '/isystems')).get('isystems', [])
+
+    async def list_ihosts(self):
+        return (await self.get(SYSINV, '/ihosts')).get('ihosts', [])
+
+    async def list_kube_clusters(self):
+        return (await self.get(SYSINV, '/kube_clusters')).get(
+            'kube_clusters', [])
+
+    async def list_service_parameters(self):
+        return (await self.get(SYSINV, '/service_parameter')).get(
+            'parameters', [])
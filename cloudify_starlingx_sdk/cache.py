@@ -0,0 +1,135 @@
+# #######
+# Copyright (c) 2021 Cloudify Platform Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import json
+import time
+import sqlite3
+from threading import Lock
+
+from .constants import (
+    DEFAULT_CACHE_TTLS,
+    DEFAULT_CACHE_PATH,
+    DEFAULT_CACHE_MAX_ENTRIES)
+
+
+class DiscoveryCache(object):
+    """A persistent cache of serialized resources in a local SQLite file.
+    Entries are keyed by auth URL, system UUID, resource type and resource
+    ID. They expire after the TTL of their resource type, and the oldest
+    entries are evicted when there are more than max_entries.
+    If bypass is set, reads miss, but writes still refresh the cache.
+    """
+
+    def __init__(self,
+                 path=None,
+                 ttls=None,
+                 max_entries=None,
+                 bypass=False):
+        self.path = path or DEFAULT_CACHE_PATH
+        self.ttls = dict(DEFAULT_CACHE_TTLS)
+        self.ttls.update(ttls or {})
+        self.max_entries = max_entries or DEFAULT_CACHE_MAX_ENTRIES
+        self.bypass = bypass
+        self._lock = Lock()
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, mode=0o700)
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False)
+        os.chmod(self.path, 0o600)
+        with self._lock, self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'auth_url TEXT, '
+                'system_uuid TEXT, '
+                'resource_type TEXT, '
+                'resource_id TEXT, '
+                'value TEXT, '
+                'stored_at REAL, '
+                'PRIMARY KEY '
+                '(auth_url, system_uuid, resource_type, resource_id))')
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS entries_stored_at '
+                'ON entries (stored_at)')
+
+    def scope(self, auth_url, system_uuid):
+        return DiscoveryCacheScope(self, auth_url, system_uuid)
+
+    def get(self, auth_url, system_uuid, resource_type, resource_id):
+        ttl = self.ttls.get(resource_type, 0)
+        if self.bypass or not ttl:
+            return
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value FROM entries WHERE auth_url = ? AND '
+                'system_uuid = ? AND resource_type = ? AND '
+                'resource_id = ? AND stored_at > ?',
+                (auth_url, str(system_uuid), resource_type, str(resource_id),
+                 time.time() - ttl)).fetchone()
+        if row:
+            return json.loads(row[0])
+
+    def set(self, auth_url, system_uuid, resource_type, resource_id, value):
+        if not self.ttls.get(resource_type, 0):
+            return
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)',
+                (auth_url, str(system_uuid), resource_type, str(resource_id),
+                 json.dumps(value), time.time()))
+            count = self._connection.execute(
+                'SELECT COUNT(*) FROM entries').fetchone()[0]
+            if count > self.max_entries:
+                self._connection.execute(
+                    'DELETE FROM entries WHERE rowid IN ('
+                    'SELECT rowid FROM entries ORDER BY stored_at LIMIT ?)',
+                    (count - self.max_entries,))
+
+    def delete(self, auth_url, system_uuid, resource_type, resource_id):
+        with self._lock, self._connection:
+            self._connection.execute(
+                'DELETE FROM entries WHERE auth_url = ? AND '
+                'system_uuid = ? AND resource_type = ? AND resource_id = ?',
+                (auth_url, str(system_uuid), resource_type, str(resource_id)))
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM entries')
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class DiscoveryCacheScope(object):
+    """The entries of a single system in a DiscoveryCache."""
+
+    def __init__(self, cache, auth_url, system_uuid):
+        self.cache = cache
+        self.auth_url = auth_url
+        self.system_uuid = system_uuid
+
+    def get(self, resource_type, resource_id):
+        return self.cache.get(
+            self.auth_url, self.system_uuid, resource_type, resource_id)
+
+    def set(self, resource_type, resource_id, value):
+        return self.cache.set(
+            self.auth_url, self.system_uuid, resource_type, resource_id, value)
+
+    def delete(self, resource_type, resource_id):
+        return self.cache.delete(
+            self.auth_url, self.system_uuid, resource_type, resource_id)
@@ -13,7 +13,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+import time
+import hashlib
 from copy import deepcopy
+from datetime import datetime
+from threading import Lock
+from collections import OrderedDict
+
+from .token_cache import TokenCache
+from .constants import (
+    TOKEN_EXPIRY_MARGIN,
+    CONNECTION_LOCK_COUNT,
+    DEFAULT_CONNECTION_MAX_AGE,
+    DEFAULT_CONNECTION_REGISTRY_SIZE)
 
 
 class StarlingXException(Exception):
@@ -29,6 +42,92 @@ class StarlingXFatalException(Exception):
         self.message = message
 
 
+def get_token_expiry(client):
+    """ Get the expiry of the keystone token of an API client, if the
+    client has a keystone session that already authenticated.
+
+    :param client: A cgtsclient or dcmanagerclient client.
+    :return float: A timestamp, or None.
+    """
+    for holder in [getattr(client, 'http_client', None), client]:
+        session = getattr(holder, 'session', None)
+        auth_ref = getattr(getattr(session, 'auth', None), 'auth_ref', None)
+        expires = getattr(auth_ref, 'expires', None)
+        if isinstance(expires, datetime):
+            return expires.timestamp()
+
+
+def project_fields(getters, fields=None):
+    """ Build a dict from the getters of the requested fields only, so that
+    fields that are not requested are neither fetched nor copied.
+
+    :param getters: A dict of field name to function without arguments.
+    :param fields: A list of field names, or None for all fields.
+    """
+    return {name: get_value() for name, get_value in getters.items()
+            if fields is None or name in fields}
+
+
+class ConnectionRegistry(object):
+    """Process-wide store of API clients, so that resources with the same
+    credentials share one keystone session and token instead of each
+    authenticating on its own.
+    At most max_size clients are kept, and the least recently used client
+    is dropped first. A client is created again when its token is about to
+    expire, or after max_age seconds if the expiry is unknown.
+    """
+
+    def __init__(self,
+                 max_size=DEFAULT_CONNECTION_REGISTRY_SIZE,
+                 max_age=DEFAULT_CONNECTION_MAX_AGE,
+                 expiry_margin=TOKEN_EXPIRY_MARGIN):
+        self.max_size = max_size
+        self.max_age = max_age
+        self.expiry_margin = expiry_margin
+        # Key to a tuple of client and creation timestamp, oldest use first.
+        self._connections = OrderedDict()
+        # A fixed set of locks that keys share, so that no lock is dropped
+        # with an evicted client while a thread creates it again.
+        self._locks = [Lock() for _ in range(CONNECTION_LOCK_COUNT)]
+        self._lock = Lock()
+
+    def get_expiry(self, connection, created_at):
+        """ The expiry of the token of a client. The session authenticates
+        on its first request, so we read the expiry each time.
+        """
+        return get_token_expiry(connection) or created_at + self.max_age
+
+    def get(self, key, factory):
+        key_lock = self._locks[hash(key) % len(self._locks)]
+        # Only one thread creates the client for a key, the others wait.
+        with key_lock:
+            with self._lock:
+                entry = self._connections.get(key)
+                if entry and \
+                        self.get_expiry(*entry) - self.expiry_margin > \
+                        time.time():
+                    self._connections.move_to_end(key)
+                    return entry[0]
+            connection = factory()
+            with self._lock:
+                self._connections[key] = (connection, time.time())
+                self._connections.move_to_end(key)
+                while len(self._connections) > self.max_size:
+                    self._connections.popitem(last=False)
+            return connection
+
+    def remove(self, key):
+        with self._lock:
+            self._connections.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._connections.clear()
+
+
+connection_registry = ConnectionRegistry()
+
+
 class StarlingXResource(object):
     # Taken from Cloudify Openstack Plugin v3, because they are basically
     # the same API base. Maybe we will merge plugins later.
@@ -38,10 +137,20 @@ class StarlingXResource(object):
     id_key = 'uuid'
     name_key = 'name'
 
-    def __init__(self, client_config, resource_config=None, logger=None):
+    def __init__(self,
+                 client_config,
+                 resource_config=None,
+                 logger=None,
+                 cache=None,
+                 token_cache=None):
         self.logger = logger
+        use_token_cache = client_config.get('token_cache', False)
         self.client_config = self.merge_configs(client_config)
         self.config = resource_config or {}
+        self.cache = cache
+        if token_cache is None and use_token_cache:
+            token_cache = TokenCache()
+        self.token_cache = token_cache
         self.resource_id = self.get_identifier()
         self.name = self.config.get(self.name_key)
         self._resource = None
@@ -55,11 +164,25 @@ class StarlingXResource(object):
     def auth_url(self):
         return self.client_config.get('auth_url')
 
+    @property
+    def client_fingerprint(self):
+        """A hash of the client config, which identifies the credentials."""
+        return hashlib.sha256(
+            json.dumps(self.client_config, sort_keys=True, default=str).encode(
+                'utf-8')).hexdigest()
+
+    @property
+    def connection_key(self):
+        return self.service_type, self.client_fingerprint
+
     @staticmethod
     def cleanup_config(config):
         return deepcopy(config)
 
     def merge_configs(self, config):
+        # Do not change the config of the caller, e.g. node properties.
+        config = deepcopy(config)
+        config.pop('token_cache', None)
         kwargs = config.pop('kwargs', {})
         config.update(kwargs)
         os_kwargs = config.pop('os_kwargs', {})
@@ -88,6 +211,23 @@ class StarlingXResource(object):
         return self.config.get(self.id_key,
                                self.config.get(self.name_key))
 
+    def cached(self, resource_type, get_value, resource_id=None):
+        """ Return a serialized value from the cache, or get and cache it.
+
+        :param resource_type: The cache resource type, e.g. host.
+        :param get_value: A function that returns the serializable value.
+        :param resource_id: The cache resource ID, by default resource_id.
+        """
+        resource_id = resource_id or self.resource_id
+        if self.cache:
+            value = self.cache.get(resource_type, resource_id)
+            if value is not None:
+                return value
+        value = get_value()
+        if self.cache:
+            self.cache.set(resource_type, resource_id, value)
+        return value
+
     @property
     def resource(self):
         if not self._resource:
@@ -0,0 +1,56 @@
+# #######
+# Copyright (c) 2021 Cloudify Platform Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+# The number of subclouds whose details are fetched at the same time.
+DEFAULT_MAX_WORKERS = 10
+
+# Subclouds are only discovered if their list entry matches these values.
+DEFAULT_SUBCLOUD_FILTER = {
+    'availability_status': ['online'],
+    'management_state': ['managed'],
+}
+
+# A discovered subcloud is fetched again if one of these fields changed.
+SUBCLOUD_CHANGE_FIELDS = ['updated_at', 'management_state', 'group_id']
+
+# The number of connections that the async transport opens at the same time.
+DEFAULT_ASYNC_CONCURRENCY = 100
+
+# The discovery cache is stored in this SQLite file on the manager.
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cloudify-starlingx', 'discovery_cache.sqlite')
+# Seconds until a cached resource of each type expires. 0 disables caching.
+DEFAULT_CACHE_TTLS = {
+    'system': 300,
+    'host': 300,
+    'subcloud': 600,
+    'subcloud_group': 3600,
+}
+DEFAULT_CACHE_MAX_ENTRIES = 50000
+
+# The number of API clients that are kept for reuse in one process.
+DEFAULT_CONNECTION_REGISTRY_SIZE = 32
+# The number of locks that keys share when their client is created.
+CONNECTION_LOCK_COUNT = 64
+# Seconds that a client is reused if the expiry of its token is unknown.
+DEFAULT_CONNECTION_MAX_AGE = 3000
+# A client is replaced if its token expires sooner than this, in seconds.
+TOKEN_EXPIRY_MARGIN = 60
+
+# Keystone tokens are shared between operations in this file, if enabled.
+DEFAULT_TOKEN_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cloudify-starlingx', 'token_cache.json')
@@ -0,0 +1,196 @@
+# #######
+# Copyright (c) 2021 Cloudify Platform Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compact, immutable snapshots of discovered resources.
+
+A record keeps only the serialized fields of a resource, without the API
+client, the client config or the client model objects, so that many of
+them can be held during discovery. Like a resource, a record has a
+resource_id and a to_dict method.
+"""
+
+
+class Record(object):
+    # A record type defines resource_id, like the resource it snapshots.
+    __slots__ = ()
+    # The serialized fields, in the order of to_dict.
+    fields = ()
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            object.__setattr__(self, name, kwargs.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            '{0} is immutable.'.format(self.__class__.__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError(
+            '{0} is immutable.'.format(self.__class__.__name__))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and \
+            self.as_tuple() == other.as_tuple()
+
+    def __hash__(self):
+        return hash((type(self), self.resource_id))
+
+    def __repr__(self):
+        return '{0}({1})'.format(
+            self.__class__.__name__,
+            ', '.join('{0}={1!r}'.format(name, getattr(self, name))
+                      for name in self.__slots__))
+
+    def as_tuple(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    @property
+    def key(self):
+        """ The key of the record in the to_dict output. """
+        return self.resource_id
+
+    def to_dict(self, fields=None):
+        """ Serialize the record like the resource that it was made from.
+
+        :param fields: Only include these fields. By default all fields.
+        """
+        return {
+            self.key: {name: getattr(self, name) for name in self.fields
+                       if fields is None or name in fields}
+        }
+
+    @classmethod
+    def from_resource(cls, resource):
+        """ Create a record from a resource, which can then be dropped. """
+        for _, fields in resource.to_dict().items():
+            return cls(**fields)
+
+
+class SubcloudRecord(Record):
+    __slots__ = ('subcloud_id',
+                 'external_id',
+                 'name',
+                 'description',
+                 'location',
+                 'group_id',
+                 'group_name',
+                 'oam_floating_ip',
+                 'management_state',
+                 'updated_at')
+    fields = __slots__[1:]
+
+    @property
+    def resource_id(self):
+        return self.subcloud_id
+
+    @property
+    def key(self):
+        return self.external_id
+
+    @classmethod
+    def from_resource(cls, resource):
+        for _, fields in resource.to_dict().items():
+            return cls(subcloud_id=resource.resource_id, **fields)
+
+
+class HostRecord(Record):
+    __slots__ = ('uuid',
+                 'hostname',
+                 'personality',
+                 'capabilities',
+                 'subfunctions')
+    fields = __slots__[1:]
+
+    @property
+    def resource_id(self):
+        return self.uuid
+
+    @classmethod
+    def from_resource(cls, resource):
+        for uuid, fields in resource.to_dict().items():
+            return cls(uuid=uuid, **fields)
+
+
+class KubeClusterRecord(Record):
+    # The credentials of the cluster are left out of the snapshot.
+    __slots__ = ('admin_user',
+                 'cluster_api_endpoint',
+                 'cluster_name',
+                 'cluster_ca_cert',
+                 'cluster_version')
+    fields = __slots__
+
+    @property
+    def resource_id(self):
+        return self.cluster_name
+
+    @classmethod
+    def from_resource(cls, resource):
+        for _, fields in resource.to_dict(fields=cls.fields).items():
+            return cls(**fields)
+
+
+class ServiceParameterRecord(Record):
+    __slots__ = ('uuid',
+                 'service',
+                 'section',
+                 'name',
+                 'value')
+    fields = __slots__[1:]
+
+    @property
+    def resource_id(self):
+        return self.uuid
+
+    @property
+    def key(self):
+        return self.value
+
+    @classmethod
+    def from_resource(cls, resource):
+        for _, fields in resource.to_dict().items():
+            return cls(uuid=resource.resource_id, **fields)
+
+
+class ApplicationRecord(Record):
+    __slots__ = ('name',
+                 'app_version',
+                 'status')
+    fields = __slots__[1:]
+
+    @property
+    def resource_id(self):
+        return self.name
+
+    @classmethod
+    def from_resource(cls, resource):
+        # The to_dict of an application has no status, so we read the
+        # listed application.
+        return cls(**{name: getattr(resource.resource, name, None)
+                      for name in cls.__slots__})
+
+
+class InventoryRecord(Record):
+    """ The inventory of one system, e.g. its applications, by system key.
+    """
+    __slots__ = ('key',
+                 'inventory')
+
+    @property
+    def resource_id(self):
+        return self.key
+
+    def to_dict(self, fields=None):
+        return {self.key: self.inventory}
@@ -14,23 +14,52 @@
 # limitations under the License.
 
 from copy import deepcopy
+from itertools import chain
+from types import SimpleNamespace
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from cgtsclient.client import get_client
 from keystoneauth1.exceptions.auth import AuthorizationFailure
 
-from ..common import (StarlingXResource, StarlingXFatalException)
+from ..common import (
+    StarlingXResource,
+    StarlingXFatalException,
+    project_fields,
+    connection_registry)
+from ..cache import DiscoveryCache
+from ..records import (
+    HostRecord,
+    ApplicationRecord,
+    SubcloudRecord,
+    KubeClusterRecord,
+    ServiceParameterRecord)
+from ..constants import (
+    DEFAULT_MAX_WORKERS,
+    SUBCLOUD_CHANGE_FIELDS,
+    DEFAULT_SUBCLOUD_FILTER)
 from .distributed_cloud import SubcloudResource
 
 NOT_STANDALONE = ['subcloud', 'systemcontroller']
 STANDALONE = ['null', None]
+# The fields of the host index, see SystemResource.host_index.
+HOST_INDEX_KEYS = ['isystem_uuid', 'personality', 'hostname']
 
 
 class ConfigurationResource(StarlingXResource):
     """Base class for objects that use the cgtsclient."""
+    service_type = 'platform'
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    def use_listed(self, listed):
+        """ Use an object from a list call as the resource. We use this for
+        objects whose list call returns every field, so that we do not get
+        them again one by one.
+        """
+        self._resource = listed
+
     @staticmethod
     def cleanup_config(config):
         creds = deepcopy(config)
@@ -51,18 +80,34 @@ class ConfigurationResource(StarlingXResource):
 
     @property
     def connection(self):
-        creds = deepcopy(self.client_config)
-        if creds.get('insecure', False) and 'ca_file' in creds:
-            del creds['ca_file']
         if not self._connection:
             try:
-                self._connection = get_client(**creds)
+                self._connection = connection_registry.get(
+                    self.connection_key, self.get_connection)
             except AuthorizationFailure as e:
                 if 'sslerror' in str(e).lower():
                     raise StarlingXFatalException('SSL validation failed.')
                 raise StarlingXFatalException(e)
         return self._connection
 
+    def get_connection(self):
+        creds = deepcopy(self.client_config)
+        if creds.get('insecure', False) and 'ca_file' in creds:
+            del creds['ca_file']
+        if self.token_cache:
+            creds['session'] = self.token_cache.get_session(
+                auth_url=creds.get('os_auth_url'),
+                username=creds.get('os_username'),
+                password=creds.get('os_password'),
+                project_name=creds.get('os_project_name'),
+                user_domain_name=creds.get('os_user_domain_name'),
+                project_domain_name=creds.get('os_project_domain_name'),
+                user_domain_id=creds.get('os_user_domain_id'),
+                project_domain_id=creds.get('os_project_domain_id'),
+                verify=False if creds.get('insecure', False)
+                else creds.get('ca_file', True))
+        return get_client(**creds)
+
     def list(self):
         raise NotImplementedError()
 
@@ -73,14 +118,32 @@ class ConfigurationResource(StarlingXResource):
 class SystemResource(ConfigurationResource):
     """Class representing Starlingx I-system or "controller" objects."""
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self,
+                 *args,
+                 max_workers=None,
+                 subcloud_filter=None,
+                 **kwargs):
         super().__init__(*args, **kwargs)
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        if subcloud_filter is None:
+            subcloud_filter = DEFAULT_SUBCLOUD_FILTER
+        self.subcloud_filter = subcloud_filter
+        if isinstance(self.cache, DiscoveryCache):
+            self.cache = self.cache.scope(
+                self.client_config.get('os_auth_url'), self.resource_id)
+        self.subcloud_failures = {}
+        self._host_index = None
         self._host_resources = None
+        self._system_uuid = None
         self._subcloud_resource = None
         self._subcloud_resources = None
         self._subcloud_resource_names = None
+        self._subcloud_group_index = None
+        self._kube_clusters = None
         self._kube_cluster_resources = None
+        self._service_parameters = None
         self._service_parameter_resources = None
+        self._applications = None
 
     def list(self):
         return self.connection.isystem.list()
@@ -97,20 +160,30 @@ class SystemResource(ConfigurationResource):
     def get_from_name(self, name):
         return self.connection.isystem.get(name)
 
-    def to_dict(self):
-        return {
-            'external_id': self.value_from_config('uuid'),
-            'name': self.value_from_config('name'),
-            'description': self.value_from_config('description'),
-            'location': self.value_from_config('location'),
-            'system_type': self.system_type,
-            'system_mode': self.system_mode,
-            'region_name': self.region_name,
-            'latitude': str(getattr(self.resource, 'latitude', None)).lower(),
-            'longitude': str(
+    def to_dict(self, fields=None):
+        """ Serialize the system.
+
+        :param fields: Only include these fields. By default all fields.
+        """
+        if fields is None:
+            return self.cached('system', self._to_dict)
+        return self._to_dict(fields)
+
+    def _to_dict(self, fields=None):
+        return project_fields({
+            'external_id': lambda: self.value_from_config('uuid'),
+            'name': lambda: self.value_from_config('name'),
+            'description': lambda: self.value_from_config('description'),
+            'location': lambda: self.value_from_config('location'),
+            'system_type': lambda: self.system_type,
+            'system_mode': lambda: self.system_mode,
+            'region_name': lambda: self.region_name,
+            'latitude': lambda: str(
+                getattr(self.resource, 'latitude', None)).lower(),
+            'longitude': lambda: str(
                 getattr(self.resource, 'longitude', None)).lower(),
-            'distributed_cloud_role': self.distributed_cloud_role
-        }
+            'distributed_cloud_role': lambda: self.distributed_cloud_role
+        }, fields)
 
     def value_from_config(self, name):
         if hasattr(self.resource, name):
@@ -171,7 +244,8 @@ class SystemResource(ConfigurationResource):
         if not self._subcloud_resource:
             self._subcloud_resource = SubcloudResource(
                 client_config=self.client_config,
-                logger=self.logger
+                logger=self.logger,
+                token_cache=self.token_cache
             )
         return self._subcloud_resource
 
@@ -179,45 +253,157 @@ class SystemResource(ConfigurationResource):
     def subclouds(self):
         """ This is a list of raw subclouds.
         """
-        subclouds = []
+        return list(self.iter_subclouds())
+
+    def iter_subclouds(self):
+        """ Yield the raw subclouds one at a time.
+        """
         for subcloud in self.subcloud_resource.list():
-            subclouds.append(subcloud)
-        return subclouds
+            yield subcloud
+
+    @property
+    def subcloud_group_index(self):
+        """ A dict of group ID to subcloud group, loaded with one list call.
+        """
+        if self._subcloud_group_index is None:
+            subcloud_groups = self.cached(
+                'subcloud_group', self._get_subcloud_groups, 'index')
+            self._subcloud_group_index = {
+                subcloud_group['group_id']: SimpleNamespace(**subcloud_group)
+                for subcloud_group in subcloud_groups}
+        return self._subcloud_group_index
+
+    def _get_subcloud_groups(self):
+        return [{'group_id': subcloud_group.group_id,
+                 'name': subcloud_group.name} for subcloud_group in
+                self.subcloud_resource.get_subcloud_group_index().values()]
 
     @property
     def subcloud_resource_names(self):
-        names = []
         if not self._subcloud_resource_names:
-            # TODO: Make parallel
-            # TODO: Here we have two calls per subcloud.
-            for subcloud in self.subclouds:
-                names.append(subcloud.name)
-            self._subcloud_resource_names = names
+            # The names come from the one list call, without any details.
+            self._subcloud_resource_names = [
+                subcloud.name for subcloud in self.subclouds]
         return self._subcloud_resource_names
 
     @property
     def subcloud_resources(self):
         """ This is a list of the subcloud resource objects.
         I.e. interfaces for storing properties in runtime, etc.
+        Only subclouds that match subcloud_filter are included.
+        See iter_subcloud_resources.
         """
-        subcloud_resources = []
         if not self._subcloud_resources:
-            # TODO: Make parallel
-            # TODO: Here we have two calls per subcloud.
-            for subcloud in self.subclouds:
-                resource = \
-                    SubcloudResource(
-                        client_config=self.client_config,
-                        resource_config={'subcloud_id': subcloud.subcloud_id},
-                        logger=self.logger)
-                if resource.resource.availability_status.lower() == 'online' \
-                        and resource.resource.management_state in ['managed']:
-                    # We only need to include online & managed resources in
-                    # the list.
-                    subcloud_resources.append(resource)
-            self._subcloud_resources = subcloud_resources
+            self._subcloud_resources = list(self.iter_subcloud_resources())
         return self._subcloud_resources
 
+    def filter_subclouds(self, subclouds):
+        """ Filter raw subclouds from the list call, so that we do not
+        request details of subclouds that we will not use.
+        """
+        return [subcloud for subcloud in subclouds
+                if self.subcloud_matches_filter(subcloud)]
+
+    def subcloud_matches_filter(self, subcloud):
+        for key, values in self.subcloud_filter.items():
+            if not isinstance(values, list):
+                values = [values]
+            value = str(getattr(subcloud, key, None)).lower()
+            if value not in [str(v).lower() for v in values]:
+                return False
+        return True
+
+    def get_changed_subclouds(self, known_subclouds):
+        """ Compare the raw subclouds with subclouds that were already
+        discovered, without requesting any subcloud details.
+
+        :param known_subclouds: A dict of subcloud ID to subcloud record, as
+          created by SubcloudResource.to_dict.
+        :return tuple: A list of the raw subclouds that are new or changed,
+          and a list of the known subcloud IDs that no longer exist or no
+          longer match subcloud_filter.
+        """
+        subclouds = self.filter_subclouds(self.subclouds)
+        changed_subclouds = []
+        for subcloud in subclouds:
+            known_subcloud = known_subclouds.get(str(subcloud.subcloud_id))
+            if not known_subcloud or known_subcloud.get('removed'):
+                changed_subclouds.append(subcloud)
+                continue
+            for field in SUBCLOUD_CHANGE_FIELDS:
+                if str(known_subcloud.get(field)) != \
+                        str(getattr(subcloud, field, None)):
+                    changed_subclouds.append(subcloud)
+                    break
+        subcloud_ids = [str(subcloud.subcloud_id) for subcloud in subclouds]
+        removed_subclouds = [subcloud_id for subcloud_id in known_subclouds
+                             if subcloud_id not in subcloud_ids]
+        return changed_subclouds, removed_subclouds
+
+    def get_subcloud_resources(self, subclouds):
+        return list(self.iter_subcloud_resources(subclouds))
+
+    def iter_subcloud_resources(self, subclouds=None):
+        """ Yield subcloud resource objects as their details are fetched.
+        At most max_workers details are requested at the same time, and
+        the order of the subclouds is kept. Subclouds that fail are skipped
+        and recorded in subcloud_failures.
+
+        :param subclouds: Raw subclouds. By default all subclouds that
+          match subcloud_filter.
+        """
+        if subclouds is None:
+            subclouds = filter(self.subcloud_matches_filter,
+                               self.iter_subclouds())
+        subclouds = iter(subclouds)
+        first_subcloud = next(subclouds, None)
+        if first_subcloud is None:
+            return
+        # Load the groups before the workers start, so they share the index.
+        self.subcloud_group_index
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = deque()
+            for subcloud in chain([first_subcloud], subclouds):
+                futures.append(
+                    (subcloud,
+                     executor.submit(self._get_subcloud_resource, subcloud)))
+                if len(futures) > self.max_workers:
+                    resource = self._get_subcloud_result(*futures.popleft())
+                    if resource:
+                        yield resource
+            while futures:
+                resource = self._get_subcloud_result(*futures.popleft())
+                if resource:
+                    yield resource
+
+    def iter_subcloud_records(self, subclouds=None):
+        """ Like iter_subcloud_resources, but yield compact snapshots of
+        the subclouds, so that the resources are dropped right away.
+        """
+        for resource in self.iter_subcloud_resources(subclouds):
+            yield SubcloudRecord.from_resource(resource)
+
+    def _get_subcloud_result(self, subcloud, future):
+        try:
+            return future.result()
+        except Exception as e:
+            self.subcloud_failures[subcloud.subcloud_id] = str(e)
+            self.logger.error(
+                'Failed to get details of subcloud {}: {}. '
+                'Skipping...'.format(subcloud.name, e))
+
+    def _get_subcloud_resource(self, subcloud):
+        resource = SubcloudResource(
+            client_config=self.client_config,
+            resource_config={'subcloud_id': subcloud.subcloud_id},
+            logger=self.logger,
+            cache=self.cache,
+            token_cache=self.token_cache,
+            subcloud_groups=self.subcloud_group_index)
+        # Fetch the record here, so that it happens in the worker thread.
+        resource.load(getattr(subcloud, 'updated_at', None))
+        return resource
+
     @property
     def oam_floating_ip(self):
         """ If the system is a subcloud,
@@ -228,15 +414,64 @@ class SystemResource(ConfigurationResource):
         else:
             return
 
+    @property
+    def system_uuid(self):
+        if self._system_uuid is None:
+            self._system_uuid = self.value_from_config('uuid')
+        return self._system_uuid
+
     @property
     def hosts(self):
         """ This is a list of raw hosts.
         """
-        host_list = []
-        for host in self.connection.ihost.list():
-            if host.isystem_uuid == self.value_from_config('uuid'):
-                host_list.append(host)
-        return host_list
+        return self.get_hosts(system_uuid=self.system_uuid)
+
+    @property
+    def host_index(self):
+        """ A dict of host field, i.e. isystem_uuid, personality and
+        hostname, to a dict of value to raw hosts. It is loaded with one
+        list call, until invalidate_hosts is called.
+        """
+        if self._host_index is None:
+            host_index = {key: {} for key in HOST_INDEX_KEYS}
+            for host in self.connection.ihost.list():
+                for key in HOST_INDEX_KEYS:
+                    host_index[key].setdefault(
+                        getattr(host, key, None), []).append(host)
+            self._host_index = host_index
+        return self._host_index
+
+    def get_hosts(self, system_uuid=None, personality=None, hostname=None):
+        """ Get raw hosts from the host index.
+
+        :param system_uuid: Only hosts of this system.
+        :param personality: Only hosts with this personality, e.g. worker.
+        :param hostname: Only the host with this hostname.
+        :return list: The hosts that match all of the given values.
+        """
+        hosts = None
+        for key, value in zip(HOST_INDEX_KEYS,
+                              [system_uuid, personality, hostname]):
+            if value is None:
+                continue
+            matches = self.host_index[key].get(value, [])
+            if hosts is None:
+                hosts = matches
+            else:
+                match_ids = set(id(host) for host in matches)
+                hosts = [host for host in hosts if id(host) in match_ids]
+        if hosts is None:
+            hosts = [host for matches in
+                     self.host_index[HOST_INDEX_KEYS[0]].values()
+                     for host in matches]
+        return list(hosts)
+
+    def invalidate_hosts(self):
+        """ Forget the host index and host resources, so that the next
+        host query lists the hosts again, e.g. after a host was added.
+        """
+        self._host_index = None
+        self._host_resources = None
 
     @property
     def host_resources(self):
@@ -246,22 +481,32 @@ class SystemResource(ConfigurationResource):
         host_resources = []
         if not self._host_resources:
             for host in self.hosts:
-                host_resources.append(
-                    HostResource(client_config=self.client_config,
-                                 resource_config={'uuid': host.uuid},
-                                 logger=self.logger))
+                host_resources.append(self.get_host_resource(host))
             # connection=self.connection))
             self._host_resources = host_resources
         return self._host_resources
 
+    def get_host_resource(self, host):
+        return HostResource(client_config=self.client_config,
+                            resource_config={'uuid': host.uuid},
+                            logger=self.logger,
+                            cache=self.cache,
+                            host=host)
+
+    @property
+    def host_records(self):
+        """ Compact snapshots of the hosts. See host_resources.
+        """
+        return [HostRecord.from_resource(self.get_host_resource(host))
+                for host in self.hosts]
+
     @property
     def kube_clusters(self):
         """ This is a list of raw Kube clusters.
         """
-        kube_cluster_list = []
-        for kube_cluster in self.connection.kube_cluster.list():
-            kube_cluster_list.append(kube_cluster)
-        return kube_cluster_list
+        if self._kube_clusters is None:
+            self._kube_clusters = list(self.connection.kube_cluster.list())
+        return self._kube_clusters
 
     @property
     def kube_cluster_resources(self):
@@ -272,23 +517,78 @@ class SystemResource(ConfigurationResource):
         if not self._kube_cluster_resources:
             for kube_cluster in self.kube_clusters:
                 kube_cluster_resources.append(
-                    KubeClusterResource(
-                        client_config=self.client_config,
-                        resource_config={
-                            'cluster_name': kube_cluster.cluster_name
-                        },
-                        logger=self.logger))
+                    self.get_kube_cluster_resource(kube_cluster))
             self._kube_cluster_resources = kube_cluster_resources
         return self._kube_cluster_resources
 
+    def get_kube_cluster_resource(self, kube_cluster):
+        return KubeClusterResource(
+            client_config=self.client_config,
+            resource_config={
+                'cluster_name': kube_cluster.cluster_name
+            },
+            logger=self.logger,
+            kube_cluster=kube_cluster)
+
+    @property
+    def kube_cluster_records(self):
+        """ Compact snapshots of the Kubernetes clusters.
+        See kube_cluster_resources.
+        """
+        return [KubeClusterRecord.from_resource(
+            self.get_kube_cluster_resource(kube_cluster))
+            for kube_cluster in self.kube_clusters]
+
     @property
     def service_parameters(self):
         """ This is a list of raw service parameters.
+        It is loaded with one list call, until invalidate_service_parameters
+        is called.
+        """
+        if self._service_parameters is None:
+            self._service_parameters = list(
+                self.connection.service_parameter.list())
+        return self._service_parameters
+
+    def get_service_parameters(self, service=None, section=None, name=None):
+        """ Get raw service parameters from the list of service parameters.
+
+        :param service: Only parameters of this service, e.g. openstack.
+        :param section: Only parameters in this section, e.g. identity.
+        :param name: Only parameters with this name, e.g. url.
+        :return list: The service parameters that match all of the given
+          values.
         """
-        service_parameter_list = []
-        for service_parameter in self.connection.service_parameter.list():
-            service_parameter_list.append(service_parameter)
-        return service_parameter_list
+        service_parameters = []
+        for service_parameter in self.service_parameters:
+            if service is not None and service_parameter.service != service:
+                continue
+            if section is not None and service_parameter.section != section:
+                continue
+            if name is not None and service_parameter.name != name:
+                continue
+            service_parameters.append(service_parameter)
+        return service_parameters
+
+    def get_service_parameter_value(self,
+                                    service,
+                                    section=None,
+                                    name=None,
+                                    default=None):
+        """ Get the value of the first service parameter that matches.
+        See get_service_parameters.
+        """
+        for service_parameter in self.get_service_parameters(
+                service, section, name):
+            return service_parameter.value
+        return default
+
+    def invalidate_service_parameters(self):
+        """ Forget the service parameters, so that the next query lists
+        them again.
+        """
+        self._service_parameters = None
+        self._service_parameter_resources = None
 
     @property
     def openstack_cluster_resource(self):
@@ -297,25 +597,82 @@ class SystemResource(ConfigurationResource):
         """
         service_parameter_resources = []
         if not self._service_parameter_resources:
-            for service_parameter in self.service_parameters:
-                if service_parameter.service != 'openstack':
-                    continue
+            for service_parameter in self.get_service_parameters(
+                    service='openstack'):
                 service_parameter_resources.append(
-                    ServiceParameterResource(
-                        client_config=self.client_config,
-                        resource_config={
-                            'uuid': service_parameter.uuid
-                        },
-                        logger=self.logger))
+                    self.get_service_parameter_resource(service_parameter))
             self._service_parameter_resources = service_parameter_resources
         return self._service_parameter_resources
 
+    def get_service_parameter_resource(self, service_parameter):
+        return ServiceParameterResource(
+            client_config=self.client_config,
+            resource_config={
+                'uuid': service_parameter.uuid
+            },
+            logger=self.logger,
+            service_parameter=service_parameter)
+
+    def get_service_parameter_records(self, *args, **kwargs):
+        """ Compact snapshots of the service parameters.
+        See get_service_parameters for the parameters.
+        """
+        return [ServiceParameterRecord.from_resource(
+            self.get_service_parameter_resource(service_parameter))
+            for service_parameter in self.get_service_parameters(
+                *args, **kwargs)]
+
+    @property
+    def applications(self):
+        """ This is a list of raw applications.
+        It is loaded with one list call, until invalidate_applications
+        is called.
+        """
+        if self._applications is None:
+            self._applications = list(self.connection.app.list())
+        return self._applications
+
+    def invalidate_applications(self):
+        """ Forget the applications, so that the next query lists
+        them again.
+        """
+        self._applications = None
+
+    def get_application_resource(self, application):
+        return ApplicationResource(
+            client_config=self.client_config,
+            resource_config={
+                'name': application.name
+            },
+            logger=self.logger,
+            application=application)
+
+    @property
+    def application_records(self):
+        """ Compact snapshots of the applications.
+        """
+        return [ApplicationRecord.from_resource(
+            self.get_application_resource(application))
+            for application in self.applications]
+
+    def get_application_inventory(self):
+        """ The applications of the system and their versions, e.g.
+        {'platform-integ-apps': {'app_version': '1.0-8',
+                                 'status': 'applied'}}
+        """
+        inventory = {}
+        for record in self.application_records:
+            inventory.update(record.to_dict())
+        return inventory
+
 
 class HostResource(ConfigurationResource):
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, host=None, **kwargs):
         super().__init__(*args, **kwargs)
         self._host_resources = None
+        # The host from the ihost list, if we already have it.
+        self._host = host
 
     def list(self):
         return self.connection.ihost.list()
@@ -323,20 +680,43 @@ class HostResource(ConfigurationResource):
     def get(self):
         return self.connection.ihost.get(self.resource_id)
 
-    def to_dict(self):
+    def to_dict(self, fields=None):
+        """ Serialize the host.
+
+        :param fields: Only include these fields. By default all fields.
+        """
+        if fields is None:
+            return self.cached('host', self._to_dict)
+        return self._to_dict(fields)
+
+    def _to_dict(self, fields=None):
         return {
-            self.resource_id: {
-                'hostname': self.resource.hostname,
-                'personality': self.resource.personality,
-                'capabilities': self.resource.capabilities,
-                'subfunctions': self.resource.subfunctions
-            }
+            self.resource_id: project_fields({
+                'hostname': lambda: self.host_value('hostname'),
+                'personality': lambda: self.host_value('personality'),
+                'capabilities': lambda: self.host_value('capabilities'),
+                'subfunctions': lambda: self.host_value('subfunctions')
+            }, fields)
         }
 
+    def host_value(self, name):
+        """ Get a field of the host from the ihost list payload. Only if the
+        list did not include it, get the host.
+        """
+        # Check the attributes directly, because a cgtsclient resource
+        # gets the host itself on access to a missing attribute.
+        if self._host is not None and name in vars(self._host):
+            return vars(self._host)[name]
+        return getattr(self.resource, name)
+
 
 class ApplicationResource(ConfigurationResource):
     id_key = 'name'
 
+    def __init__(self, *args, application=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.use_listed(application)
+
     def list(self):
         return self.connection.app.list()
 
@@ -355,30 +735,44 @@ class ApplicationResource(ConfigurationResource):
 class KubeClusterResource(ConfigurationResource):
     id_key = 'cluster_name'
 
+    def __init__(self, *args, kube_cluster=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The credentials stay on the listed cluster until they are read.
+        self.use_listed(kube_cluster)
+
     def list(self):
         return self.connection.kube_cluster.list()
 
     def get(self):
         return self.connection.kube_cluster.get(self.resource_id)
 
-    def to_dict(self):
+    def to_dict(self, fields=None):
+        """ Serialize the cluster.
+
+        :param fields: Only include these fields. By default all fields.
+        """
         return {
-            self.resource.cluster_name: {
-                'admin_user': self.resource.admin_user,
-                'admin_token': self.resource.admin_token,
-                'cluster_api_endpoint': self.resource.cluster_api_endpoint,
-                'admin_client_cert': self.resource.admin_client_cert,
-                'cluster_name': self.resource.cluster_name,
-                'cluster_ca_cert': self.resource.cluster_ca_cert,
-                'cluster_version': self.resource.cluster_version,
-                'admin_client_key': self.resource.admin_client_key
-            }
+            self.resource.cluster_name: project_fields({
+                'admin_user': lambda: self.resource.admin_user,
+                'admin_token': lambda: self.resource.admin_token,
+                'cluster_api_endpoint':
+                    lambda: self.resource.cluster_api_endpoint,
+                'admin_client_cert': lambda: self.resource.admin_client_cert,
+                'cluster_name': lambda: self.resource.cluster_name,
+                'cluster_ca_cert': lambda: self.resource.cluster_ca_cert,
+                'cluster_version': lambda: self.resource.cluster_version,
+                'admin_client_key': lambda: self.resource.admin_client_key
+            }, fields)
         }
 
 
 class ServiceParameterResource(ConfigurationResource):
     id_key = 'uuid'
 
+    def __init__(self, *args, service_parameter=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.use_listed(service_parameter)
+
     def list(self):
         return self.connection.service_parameter.list()
 
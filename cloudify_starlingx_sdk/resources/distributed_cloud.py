@@ -16,7 +16,11 @@
 import os
 from copy import deepcopy
 
-from ..common import (StarlingXResource, StarlingXException)
+from ..common import (
+    StarlingXResource,
+    StarlingXException,
+    project_fields,
+    connection_registry)
 
 from keystoneauth1 import session
 from keystoneauth1.identity import v3
@@ -28,6 +32,7 @@ from keystoneauth1.exceptions.catalog import EndpointNotFound
 
 
 class DistributedCloudResource(StarlingXResource):
+    service_type = 'dcmanager'
 
     @staticmethod
     def cleanup_config(config):
@@ -46,32 +51,38 @@ class DistributedCloudResource(StarlingXResource):
     @property
     def connection(self):
         if not self._connection:
-            cacert = self.client_config.get('cacert')
-            insecure = self.client_config.get(
-                'insecure', False)
-            if cacert or insecure:
-                if cacert:
-                    os.environ["REQUESTS_CA_BUNDLE"] = cacert
-                auth_dict = dict(
-                    auth_url=self.client_config.get('auth_url'),
-                    username=self.client_config.get('username'),
-                    password=self.client_config.get('api_key'),
-                    project_name=self.client_config.get('project_name'),
-                    user_domain_name=self.client_config.get(
-                        'user_domain_name'),
-                    project_domain_name=self.client_config.get(
-                        'project_domain_name'),
-                )
-                auth = v3.Password(**auth_dict)
-                sess = session.Session(
-                    auth=auth, verify=cacert if not insecure else False)
-                self._connection = client_v1.Client(
-                    session=sess,
-                    insecure=insecure)
-            else:
-                self._connection = client.client(**self.client_config)
+            self._connection = connection_registry.get(
+                self.connection_key, self.get_connection)
         return self._connection
 
+    def get_connection(self):
+        cacert = self.client_config.get('cacert')
+        insecure = self.client_config.get(
+            'insecure', False)
+        if cacert or insecure or self.token_cache:
+            if cacert:
+                os.environ["REQUESTS_CA_BUNDLE"] = cacert
+            auth_dict = dict(
+                auth_url=self.client_config.get('auth_url'),
+                username=self.client_config.get('username'),
+                password=self.client_config.get('api_key'),
+                project_name=self.client_config.get('project_name'),
+                user_domain_name=self.client_config.get(
+                    'user_domain_name'),
+                project_domain_name=self.client_config.get(
+                    'project_domain_name'),
+            )
+            verify = (cacert or True) if not insecure else False
+            if self.token_cache:
+                sess = self.token_cache.get_session(verify=verify, **auth_dict)
+            else:
+                auth = v3.Password(**auth_dict)
+                sess = session.Session(auth=auth, verify=verify)
+            return client_v1.Client(
+                session=sess,
+                insecure=insecure)
+        return client.client(**self.client_config)
+
     def list(self):
         raise NotImplementedError()
 
@@ -81,10 +92,15 @@ class DistributedCloudResource(StarlingXResource):
 
 class SubcloudResource(DistributedCloudResource):
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, subcloud_groups=None, **kwargs):
         super().__init__(*args, **kwargs)
         self._subcloud_detail = None
-        self._subcloud_group_detail = None
+        self._record = None
+        # A dict of group ID to subcloud group. It may be shared by
+        # several subcloud resources, see get_subcloud_group_index.
+        if subcloud_groups is None:
+            subcloud_groups = {}
+        self._subcloud_groups = subcloud_groups
 
     id_key = 'subcloud_id'
 
@@ -152,18 +168,70 @@ class SubcloudResource(DistributedCloudResource):
         resource = self._get_detail(name)
         return resource.oam_floating_ip
 
-    def to_dict(self):
-        return self.get_subcloud_as_dict(self.resource)
+    def to_dict(self, fields=None):
+        """ Serialize the subcloud.
+
+        :param fields: Only include these fields. By default all fields.
+          If the record was not loaded yet, only the requested fields are
+          fetched, e.g. without group_name the group is not requested.
+        """
+        if fields is None:
+            if self._record is None:
+                self.load()
+            return self._record
+        if self._record is None:
+            return self.get_subcloud_as_dict(self.resource, fields)
+        return {key: {name: value for name, value in record.items()
+                      if name in fields}
+                for key, record in self._record.items()}
+
+    def load(self, updated_at=None):
+        """ Get the subcloud record from the cache or from the API.
+
+        :param updated_at: The updated_at value from the subclouds list.
+          A cached record that was updated at another time is not used.
+        """
+        if self.cache:
+            record = self.cache.get('subcloud', self.resource_id)
+            if record and (updated_at is None or updated_at == record.get(
+                    str(self.resource_id), {}).get('updated_at')):
+                self._record = record
+                return
+        self._record = self.get_subcloud_as_dict(self.resource)
+        if self.cache:
+            self.cache.set('subcloud', self.resource_id, self._record)
 
     @property
     def subcloud_group_detail(self):
-        if not self._subcloud_group_detail:
-            self._subcloud_group_detail = self.get_subcloud_group()
-        return self._subcloud_group_detail
+        return self.get_subcloud_group_detail(self.resource.group_id)
+
+    def get_subcloud_group_detail(self, group_id):
+        """ Like get_subcloud_group, but the group is only requested once.
+        """
+        if group_id not in self._subcloud_groups:
+            self._subcloud_groups[group_id] = self.get_subcloud_group(
+                group_id)
+        return self._subcloud_groups[group_id]
+
+    def list_subcloud_groups(self):
+        return self.connection.subcloud_group_manager.list_subcloud_groups()
+
+    def get_subcloud_group_index(self):
+        """ Load all subcloud groups with a single list call.
+
+        :return dict: A dict of group ID to subcloud group, which can be
+          passed to other subcloud resources as subcloud_groups.
+        """
+        try:
+            subcloud_groups = self.list_subcloud_groups()
+        except EndpointNotFound:
+            subcloud_groups = []
+        for subcloud_group in subcloud_groups:
+            self._subcloud_groups[subcloud_group.group_id] = subcloud_group
+        return self._subcloud_groups
 
     def get_subcloud_group(self, group_id=None):
         group_id = group_id or self.resource.group_id
-        # TODO: We should only need to call this one time.
         try:
             result = self.connection.subcloud_group_manager.\
                 subcloud_group_detail(group_id)
@@ -175,24 +243,28 @@ class SubcloudResource(DistributedCloudResource):
         return result
 
     def get_subcloud_group_name(self, group_id):
-        if group_id == self.resource.group_id:
-            return self.subcloud_group_detail.name
-        subcloud_group = self.get_subcloud_group(group_id)
+        subcloud_group = self.get_subcloud_group_detail(group_id)
         if subcloud_group:
             return subcloud_group.name
 
-    def get_subcloud_as_dict(self, resource):
+    def get_subcloud_as_dict(self, resource, fields=None):
         return {
-            str(resource.subcloud_id): {
-                'external_id': str(resource.subcloud_id),
-                'name': resource.name,
-                'description': resource.description,
-                'location': str(resource.location).lower(),
-                'group_id': resource.group_id,
-                'group_name': self.get_subcloud_group_name(resource.group_id),
-                'oam_floating_ip': self.get_oam_floating_ip(resource.name),
-                'management_state': resource.management_state
-            }
+            str(resource.subcloud_id): project_fields({
+                'external_id': lambda: str(resource.subcloud_id),
+                'name': lambda: resource.name,
+                'description': lambda: resource.description,
+                'location': lambda: str(resource.location).lower(),
+                'group_id': lambda: resource.group_id,
+                'group_name': lambda: self.get_subcloud_group_name(
+                    resource.group_id),
+                # The resource is usually the subcloud additional details,
+                # which already contain the OAM floating IP.
+                'oam_floating_ip': lambda: (
+                    getattr(resource, 'oam_floating_ip', None) or
+                    self.get_oam_floating_ip(resource.name)),
+                'management_state': lambda: resource.management_state,
+                'updated_at': lambda: getattr(resource, 'updated_at', None)
+            }, fields)
         }
 
     def get_subcloud_from_name(self, name):
@@ -0,0 +1,142 @@
+# #######
+# Copyright (c) 2021 Cloudify Platform Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+import json
+import asyncio
+import unittest
+from threading import Thread
+from socketserver import ThreadingMixIn
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from .test_common import StarlingXCommonBase
+from ..common import StarlingXException
+from ..async_transport import aiohttp, AsyncStarlingXClient
+
+SUBCLOUDS = [{'subcloud_id': i, 'name': 'subcloud{}'.format(i)}
+             for i in range(1, 51)]
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StubStarlingXHandler(BaseHTTPRequestHandler):
+    """Answers like keystone, dcmanager and sysinv on one port."""
+
+    def log_message(self, *_):
+        pass
+
+    def send_json(self, body, status=200, headers=None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        body = json.loads(self.rfile.read(length))
+        self.server.auth_requests.append(body)
+        url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+        catalog = [
+            {'type': 'dcmanager',
+             'endpoints': [{'interface': 'public',
+                            'region': 'SystemController',
+                            'url': url + '/dcmanager/v1.0'}]},
+            {'type': 'platform',
+             'endpoints': [{'interface': 'public',
+                            'region': 'RegionOne',
+                            'url': url + '/sysinv/v1'}]},
+        ]
+        self.send_json(
+            {'token': {'catalog': catalog,
+                       'expires_at': '2999-01-01T00:00:00.000000Z'}},
+            status=201,
+            headers={'X-Subject-Token': 'token'})
+
+    def do_GET(self):
+        if self.headers.get('X-Auth-Token') != 'token':
+            return self.send_json({}, status=401)
+        if self.path == '/dcmanager/v1.0/subclouds':
+            return self.send_json({'subclouds': SUBCLOUDS})
+        detail = re.match(r'^/dcmanager/v1.0/subclouds/(\d+)/detail$',
+                          self.path)
+        if detail:
+            subcloud_id = int(detail.group(1))
+            if subcloud_id == 13:
+                return self.send_json({}, status=500)
+            return self.send_json(
+                {'subcloud_id': subcloud_id,
+                 'oam_floating_ip': '10.10.10.{}'.format(subcloud_id)})
+        if self.path == '/sysinv/v1/isystems':
+            return self.send_json({'isystems': [{'uuid': 'foo'}]})
+        self.send_json({}, status=404)
+
+
+@unittest.skipIf(not aiohttp, 'aiohttp is not installed.')
+class AsyncStarlingXClientTest(StarlingXCommonBase):
+
+    def setUp(self):
+        super(AsyncStarlingXClientTest, self).setUp()
+        self.server = StubServer(
+            ('127.0.0.1', 0), StubStarlingXHandler)
+        self.server.auth_requests = []
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client_config = {
+            'os_auth_url': 'http://127.0.0.1:{}/v3'.format(
+                self.server.server_port),
+            'os_username': 'foo',
+            'os_password': 'bar',
+            'os_project_name': 'admin',
+            'os_region_name': 'RegionOne',
+            'api_version': 1
+        }
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super(AsyncStarlingXClientTest, self).tearDown()
+
+    def test_async_client(self):
+
+        async def discover():
+            async with AsyncStarlingXClient(self.client_config) as client:
+                subclouds = await client.list_subclouds()
+                details = await client.subclouds_additional_details(
+                    [subcloud['subcloud_id'] for subcloud in subclouds])
+                systems = await client.list_isystems()
+            return subclouds, details, systems
+
+        loop = asyncio.new_event_loop()
+        try:
+            subclouds, details, systems = loop.run_until_complete(discover())
+        finally:
+            loop.close()
+        self.assertEqual(subclouds, SUBCLOUDS)
+        self.assertEqual(systems, [{'uuid': 'foo'}])
+        self.assertEqual(len(details), 50)
+        self.assertEqual(details[0]['oam_floating_ip'], '10.10.10.1')
+        self.assertEqual(details[49]['subcloud_id'], 50)
+        self.assertIsInstance(details[12], StarlingXException)
+        # The token is requested once, with the cgtsclient style config.
+        self.assertEqual(len(self.server.auth_requests), 1)
+        user = self.server.auth_requests[0]['auth']['identity'][
+            'password']['user']
+        self.assertEqual(user['name'], 'foo')
+        self.assertEqual(user['password'], 'bar')
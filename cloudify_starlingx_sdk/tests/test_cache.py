@@ -0,0 +1,117 @@
+# #######
+# Copyright (c) 2021 Cloudify Platform Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+import shutil
+import tempfile
+from unittest.mock import Mock, patch
+
+from .test_common import StarlingXCommonBase
+from ..cache import DiscoveryCache
+from ..resources.configuration import SystemResource
+
+
+class DiscoveryCacheTest(StarlingXCommonBase):
+
+    def setUp(self):
+        super(DiscoveryCacheTest, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache', 'cache.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super(DiscoveryCacheTest, self).tearDown()
+
+    def test_cache_ttl_eviction_bypass(self):
+        cache = DiscoveryCache(
+            path=self.path, ttls={'host': 0, 'subcloud': 10}, max_entries=2)
+        scope = cache.scope('http://foo:5000/v3', 'bar')
+        scope.set('subcloud', 1, {'1': {'name': 'subcloud1'}})
+        scope.set('host', 'foo', {'foo': {}})
+        self.assertEqual(
+            scope.get('subcloud', 1), {'1': {'name': 'subcloud1'}})
+        self.assertIsNone(scope.get('host', 'foo'))
+        self.assertIsNone(
+            cache.scope('http://foo:5000/v3', 'baz').get('subcloud', 1))
+
+        later = time.time() + 3600
+        with patch('cloudify_starlingx_sdk.cache.time.time',
+                   return_value=later):
+            self.assertIsNone(scope.get('subcloud', 1))
+
+        scope.set('subcloud', 2, {})
+        scope.set('subcloud', 3, {})
+        self.assertIsNone(scope.get('subcloud', 1))
+        self.assertEqual(scope.get('subcloud', 3), {})
+        cache.close()
+
+        cache = DiscoveryCache(path=self.path, bypass=True)
+        scope = cache.scope('http://foo:5000/v3', 'bar')
+        self.assertIsNone(scope.get('subcloud', 3))
+        cache.bypass = False
+        self.assertEqual(scope.get('subcloud', 3), {})
+        cache.close()
+
+    @patch('cloudify_starlingx_sdk.resources.distributed_cloud.client')
+    @patch('cloudify_starlingx_sdk.resources.configuration.get_client')
+    def test_system_warm_start(self, _, client):
+        subclouds = [Mock(subcloud_id=i,
+                          group_id=1,
+                          description='',
+                          location='',
+                          oam_floating_ip='10.10.10.{}'.format(i),
+                          updated_at='2021-10-01 10:00:00',
+                          availability_status='online',
+                          management_state='managed') for i in range(3)]
+        group = Mock(group_id=1)
+        group.name = 'group1'
+        for subcloud in subclouds:
+            subcloud.name = 'subcloud{}'.format(subcloud.subcloud_id)
+        connection = client.client.return_value
+        connection.subcloud_manager.list_subclouds.return_value = subclouds
+        connection.subcloud_manager.subcloud_additional_details.side_effect = \
+            lambda subcloud_id: [subclouds[subcloud_id]]
+        connection.subcloud_group_manager.list_subcloud_groups.return_value = \
+            [group]
+
+        def discover():
+            cache = DiscoveryCache(path=self.path)
+            resource = SystemResource(
+                client_config={'auth_url': 'http://foo:5000/v3'},
+                resource_config={'uuid': 'bar'},
+                logger=Mock(),
+                cache=cache)
+            records = [subcloud.to_dict()
+                       for subcloud in resource.iter_subcloud_resources()]
+            cache.close()
+            return records
+
+        records = discover()
+        self.assertEqual(records[2]['2']['group_name'], 'group1')
+        self.assertEqual(discover(), records)
+        self.assertEqual(
+            connection.subcloud_manager.subcloud_additional_details
+            .call_count, 3)
+        self.assertEqual(
+            connection.subcloud_group_manager.list_subcloud_groups
+            .call_count, 1)
+
+        # A subcloud that was updated since it was cached is fetched again.
+        subclouds[1].updated_at = '2021-10-02 10:00:00'
+        discover()
+        self.assertEqual(
+            connection.subcloud_manager.subcloud_additional_details
+            .call_count, 4)
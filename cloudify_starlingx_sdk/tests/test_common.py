@@ -13,15 +13,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
 import unittest
+from threading import Event
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
-from ..common import StarlingXResource
+from ..common import (
+    StarlingXResource,
+    ConnectionRegistry,
+    connection_registry)
 
 
 class StarlingXCommonBase(unittest.TestCase):
 
     def setUp(self):
         super(StarlingXCommonBase, self).setUp()
+        connection_registry.clear()
 
 
 class StarlingXResourceTest(StarlingXCommonBase):
@@ -39,3 +47,96 @@ class StarlingXResourceTest(StarlingXCommonBase):
         self.assertEqual(resource.resource_id,
                          '00000000-0000-0000-0000-000000000000')
         self.assertEqual(resource.name, 'foo-name')
+
+    def test_starlingx_resource_client_config(self):
+        client_config = {'foo': 'foo',
+                         'token_cache': True,
+                         'kwargs': {'bar': 'bar'}}
+        resource = StarlingXResource(
+            client_config=client_config,
+            token_cache=unittest.mock.Mock())
+        self.assertNotIn('token_cache', resource.client_config)
+        self.assertEqual(client_config,
+                         {'foo': 'foo',
+                          'token_cache': True,
+                          'kwargs': {'bar': 'bar'}})
+
+    def test_connection_registry(self):
+        parent = StarlingXResource(
+            client_config={'foo': 'foo', 'bar': 'bar'})
+        child = StarlingXResource(
+            client_config={'bar': 'bar', 'foo': 'foo'})
+        other = StarlingXResource(
+            client_config={'foo': 'foo', 'bar': 'baz'})
+        self.assertEqual(parent.connection_key, child.connection_key)
+        self.assertNotEqual(parent.connection_key, other.connection_key)
+
+        factory = unittest.mock.Mock(side_effect=lambda: object())
+        connection = connection_registry.get(parent.connection_key, factory)
+        self.assertIs(
+            connection_registry.get(child.connection_key, factory),
+            connection)
+        self.assertIsNot(
+            connection_registry.get(other.connection_key, factory),
+            connection)
+        self.assertEqual(factory.call_count, 2)
+
+    def test_connection_registry_eviction_and_expiry(self):
+        registry = ConnectionRegistry(max_size=2, max_age=3600)
+        factory = unittest.mock.Mock(
+            side_effect=lambda: unittest.mock.Mock(spec=[]))
+        foo = registry.get('foo', factory)
+        registry.get('bar', factory)
+        # foo was used last, so bar is evicted.
+        self.assertIs(registry.get('foo', factory), foo)
+        registry.get('baz', factory)
+        registry.get('bar', factory)
+        self.assertEqual(factory.call_count, 4)
+        self.assertIs(registry.get('bar', factory), registry.get('bar', None))
+
+        # A client whose token is about to expire is replaced.
+        expiring = unittest.mock.Mock()
+        expiring.http_client.session.auth.auth_ref.expires = \
+            datetime.now(timezone.utc) + timedelta(seconds=30)
+        factory = unittest.mock.Mock(side_effect=[expiring, object()])
+        self.assertIs(registry.get('qux', factory), expiring)
+        self.assertIsNot(registry.get('qux', factory), expiring)
+        self.assertEqual(factory.call_count, 2)
+
+        # The expiry is read when the client is reused, after the session
+        # authenticated on its first request.
+        authenticating = unittest.mock.Mock()
+        authenticating.http_client.session.auth.auth_ref = None
+        factory = unittest.mock.Mock(side_effect=[authenticating, object()])
+        self.assertIs(registry.get('quux', factory), authenticating)
+        authenticating.http_client.session.auth.auth_ref = unittest.mock.Mock(
+            expires=datetime.now(timezone.utc) + timedelta(seconds=30))
+        self.assertIsNot(registry.get('quux', factory), authenticating)
+
+    def test_connection_registry_concurrent_eviction(self):
+        registry = ConnectionRegistry(max_size=1)
+        expiring = unittest.mock.Mock()
+        expiring.http_client.session.auth.auth_ref.expires = \
+            datetime.now(timezone.utc) + timedelta(seconds=30)
+        started = Event()
+        release = Event()
+
+        def create():
+            started.set()
+            release.wait(5)
+            return unittest.mock.Mock(spec=[])
+
+        factory = unittest.mock.Mock(side_effect=[expiring])
+        registry.get('foo', factory)
+        factory.side_effect = create
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # The first thread creates foo again, because its token expires.
+            first = executor.submit(registry.get, 'foo', factory)
+            started.wait(5)
+            # bar evicts foo while the first thread creates it.
+            registry.get('bar', lambda: unittest.mock.Mock(spec=[]))
+            second = executor.submit(registry.get, 'foo', factory)
+            time.sleep(0.1)
+            release.set()
+            self.assertIs(first.result(), second.result())
+        self.assertEqual(factory.call_count, 2)
@@ -13,8 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
+from dcmanagerclient.exceptions import APIException
+
 from .test_common import StarlingXCommonBase
 from ..resources.configuration import (SystemResource, ApplicationResource)
 
@@ -51,3 +54,209 @@ class StarlingXDistributedCloudTest(StarlingXCommonBase):
         self.assertEqual(resource.name, 'foo-name')
         self.assertIsNotNone(resource.get())
         self.assertIsNotNone(resource.list())
+
+    @patch('cloudify_starlingx_sdk.resources.distributed_cloud.client')
+    @patch('cloudify_starlingx_sdk.resources.configuration.get_client')
+    def test_system_subcloud_resources(self, _, client):
+        subclouds = [Mock(subcloud_id=i,
+                          availability_status='online',
+                          management_state='managed') for i in range(1, 7)]
+        for subcloud in subclouds:
+            subcloud.name = 'subcloud{}'.format(subcloud.subcloud_id)
+        subclouds[5].availability_status = 'offline'
+
+        def subcloud_additional_details(subcloud_id):
+            if subcloud_id == 3:
+                raise APIException('Subcloud not found')
+            return [Mock(subcloud_id=subcloud_id)]
+
+        subcloud_manager = client.client.return_value.subcloud_manager
+        subcloud_manager.list_subclouds.return_value = subclouds
+        subcloud_manager.subcloud_additional_details.side_effect = \
+            subcloud_additional_details
+        resource = SystemResource(
+            client_config={'foo': 'foo', 'bar': 'bar'},
+            resource_config={'uuid': '00000000-0000-0000-0000-000000000000'},
+            logger=Mock(),
+            max_workers=2
+        )
+        self.assertEqual(
+            [r.resource_id for r in resource.subcloud_resources],
+            [1, 2, 4, 5])
+        self.assertEqual(list(resource.subcloud_failures), [3])
+        # The offline subcloud is filtered out before its detail is fetched.
+        self.assertEqual(
+            subcloud_manager.subcloud_additional_details.call_count, 5)
+
+        resource = SystemResource(
+            client_config={'foo': 'foo', 'bar': 'bar'},
+            resource_config={'uuid': '00000000-0000-0000-0000-000000000000'},
+            logger=Mock(),
+            subcloud_filter={'availability_status': 'Offline'}
+        )
+        self.assertEqual(
+            [r.resource_id for r in resource.subcloud_resources], [6])
+
+    @patch('cloudify_starlingx_sdk.resources.distributed_cloud.client')
+    @patch('cloudify_starlingx_sdk.resources.configuration.get_client')
+    def test_system_subcloud_group_index(self, _, client):
+        subclouds = [Mock(subcloud_id=i,
+                          group_id=i % 2,
+                          availability_status='online',
+                          management_state='managed') for i in range(4)]
+        groups = [Mock(group_id=i) for i in range(2)]
+        for group in groups:
+            group.name = 'group{}'.format(group.group_id)
+
+        connection = client.client.return_value
+        connection.subcloud_manager.list_subclouds.return_value = subclouds
+        connection.subcloud_manager.subcloud_additional_details.side_effect = \
+            lambda subcloud_id: [subclouds[subcloud_id]]
+        connection.subcloud_group_manager.list_subcloud_groups.return_value = \
+            groups
+        resource = SystemResource(
+            client_config={'foo': 'foo', 'bar': 'bar'},
+            resource_config={'uuid': '00000000-0000-0000-0000-000000000000'},
+            logger=Mock()
+        )
+        group_names = [
+            subcloud.to_dict()[str(subcloud.resource_id)]['group_name']
+            for subcloud in resource.subcloud_resources]
+        self.assertEqual(group_names, ['group0', 'group1', 'group0', 'group1'])
+        connection.subcloud_group_manager.list_subcloud_groups \
+            .assert_called_once_with()
+        connection.subcloud_group_manager.subcloud_group_detail \
+            .assert_not_called()
+
+    @patch('cloudify_starlingx_sdk.resources.distributed_cloud.client')
+    @patch('cloudify_starlingx_sdk.resources.configuration.get_client')
+    def test_system_changed_subclouds(self, _, client):
+        subclouds = [Mock(subcloud_id=i,
+                          group_id=1,
+                          updated_at='2021-10-01 10:00:00',
+                          availability_status='online',
+                          management_state='managed') for i in range(1, 5)]
+        subclouds[1].updated_at = '2021-10-02 10:00:00'
+        known_subclouds = {
+            str(i): {
+                'group_id': 1,
+                'updated_at': '2021-10-01 10:00:00',
+                'management_state': 'managed'
+            } for i in [1, 2, 3, 5]
+        }
+        known_subclouds['3']['removed'] = True
+        # Subcloud 4 was discovered, but no longer matches the filter.
+        subclouds[3].availability_status = 'offline'
+        known_subclouds['4'] = dict(known_subclouds['1'])
+
+        connection = client.client.return_value
+        connection.subcloud_manager.list_subclouds.return_value = subclouds
+        resource = SystemResource(
+            client_config={'foo': 'foo', 'bar': 'bar'},
+            resource_config={'uuid': '00000000-0000-0000-0000-000000000000'},
+            logger=Mock()
+        )
+        changed, removed = resource.get_changed_subclouds(known_subclouds)
+        self.assertEqual([s.subcloud_id for s in changed], [2, 3])
+        self.assertEqual(sorted(removed), ['4', '5'])
+        connection.subcloud_manager.subcloud_additional_details \
+            .assert_not_called()
+
+    @patch('cloudify_starlingx_sdk.resources.configuration.get_client')
+    def test_system_host_resources(self, get_client):
+        system_uuid = '00000000-0000-0000-0000-000000000000'
+        hosts = [SimpleNamespace(uuid='host{}'.format(i),
+                                 hostname='controller-{}'.format(i),
+                                 personality='controller',
+                                 capabilities={},
+                                 subfunctions='controller',
+                                 isystem_uuid=system_uuid) for i in range(3)]
+        # The list does not include every field of this host.
+        del hosts[2].subfunctions
+        connection = get_client.return_value
+        connection.isystem.get.return_value = SimpleNamespace(uuid=system_uuid)
+        connection.ihost.list.return_value = hosts
+        connection.ihost.get.return_value = SimpleNamespace(
+            subfunctions='controller,worker')
+        resource = SystemResource(
+            client_config={'foo': 'foo', 'bar': 'bar'},
+            resource_config={'uuid': system_uuid},
+            logger=Mock()
+        )
+        records = [host.to_dict() for host in resource.host_resources]
+        self.assertEqual(records[0]['host0']['hostname'], 'controller-0')
+        self.assertEqual(
+            records[2]['host2']['subfunctions'], 'controller,worker')
+        connection.ihost.get.assert_called_once_with('host2')
+
+        hosts[1].personality = 'worker'
+        resource.invalidate_hosts()
+        self.assertEqual(
+            resource.get_hosts(personality='worker', hostname='controller-1'),
+            [hosts[1]])
+        self.assertEqual(resource.get_hosts(hostname='controller-3'), [])
+        self.assertEqual(len(resource.hosts), 3)
+        self.assertEqual(connection.ihost.list.call_count, 2)
+
+    @patch('cloudify_starlingx_sdk.resources.configuration.get_client')
+    def test_system_service_parameters(self, get_client):
+        service_parameters = [
+            SimpleNamespace(uuid='parameter{}'.format(i),
+                            service=service,
+                            section='identity',
+                            name='url',
+                            value='http://10.10.10.{}:5000/v3'.format(i))
+            for i, service in enumerate(['identity', 'openstack'])]
+        connection = get_client.return_value
+        connection.service_parameter.list.return_value = service_parameters
+        resource = SystemResource(
+            client_config={'foo': 'foo', 'bar': 'bar'},
+            resource_config={'uuid': '00000000-0000-0000-0000-000000000000'},
+            logger=Mock()
+        )
+        self.assertEqual(
+            resource.get_service_parameter_value('openstack', 'identity'),
+            'http://10.10.10.1:5000/v3')
+        self.assertIsNone(
+            resource.get_service_parameter_value('openstack', 'platform'))
+        self.assertEqual(
+            resource.get_service_parameters(section='identity', name='url'),
+            service_parameters)
+        openstack = resource.openstack_cluster_resource
+        self.assertEqual(openstack[0].value(), 'http://10.10.10.1:5000/v3')
+        self.assertEqual(
+            openstack[0].to_dict()['http://10.10.10.1:5000/v3']['service'],
+            'openstack')
+        connection.service_parameter.list.assert_called_once_with()
+        connection.service_parameter.get.assert_not_called()
+
+    @patch('cloudify_starlingx_sdk.resources.configuration.get_client')
+    def test_system_kube_cluster_resources(self, get_client):
+        kube_cluster = SimpleNamespace(
+            cluster_name='kubernetes',
+            cluster_version='v1.21.8',
+            cluster_api_endpoint='https://10.10.10.2:6443',
+            admin_user='kubernetes-admin',
+            admin_token='Zm9vCg==',
+            admin_client_cert='cert',
+            admin_client_key='key',
+            cluster_ca_cert='ca')
+        connection = get_client.return_value
+        connection.kube_cluster.list.return_value = [kube_cluster]
+        resource = SystemResource(
+            client_config={'foo': 'foo', 'bar': 'bar'},
+            resource_config={'uuid': '00000000-0000-0000-0000-000000000000'},
+            logger=Mock()
+        )
+        kube_clusters = resource.kube_cluster_resources
+        self.assertIs(resource.kube_clusters[0], kube_cluster)
+        self.assertEqual(
+            kube_clusters[0].to_dict()['kubernetes']['admin_client_key'],
+            'key')
+        self.assertEqual(kube_clusters[0].resource.admin_token, 'Zm9vCg==')
+        record = resource.kube_cluster_records[0].to_dict()['kubernetes']
+        self.assertEqual(record['cluster_version'], 'v1.21.8')
+        self.assertNotIn('admin_token', record)
+        self.assertNotIn('admin_client_key', record)
+        connection.kube_cluster.list.assert_called_once_with()
+        connection.kube_cluster.get.assert_not_called()
@@ -13,7 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, call
 
 from .test_common import StarlingXCommonBase
 from ..resources.distributed_cloud import SubcloudResource
@@ -45,3 +45,60 @@ class StarlingXDistributedCloudTest(StarlingXCommonBase):
         self.assertEqual(resource.name, 'foo-name')
         self.assertIsNotNone(resource.get())
         self.assertIsNotNone(resource.list())
+
+    @patch('cloudify_starlingx_sdk.resources.distributed_cloud.client')
+    def test_subcloud_to_dict_api_calls(self, client):
+        connection = client.client.return_value
+        detail = Mock(subcloud_id=1,
+                      description='foo',
+                      location='Bar',
+                      group_id=2,
+                      oam_floating_ip='10.10.10.10',
+                      management_state='managed',
+                      updated_at='2021-10-01 10:00:00')
+        detail.name = 'subcloud1'
+        group = Mock()
+        group.name = 'group2'
+        connection.subcloud_manager.subcloud_additional_details.return_value \
+            = [detail]
+        connection.subcloud_group_manager.subcloud_group_detail.return_value \
+            = [group]
+
+        resource = SubcloudResource(
+            client_config={'foo': 'foo', 'bar': 'bar'},
+            resource_config={'subcloud_id': 1},
+            logger=Mock()
+        )
+        expected = {
+            '1': {
+                'external_id': '1',
+                'name': 'subcloud1',
+                'description': 'foo',
+                'location': 'bar',
+                'group_id': 2,
+                'group_name': 'group2',
+                'oam_floating_ip': '10.10.10.10',
+                'management_state': 'managed',
+                'updated_at': '2021-10-01 10:00:00'
+            }
+        }
+        # Only the requested fields are fetched.
+        self.assertEqual(
+            resource.to_dict(fields=['name', 'group_id']),
+            {'1': {'name': 'subcloud1', 'group_id': 2}})
+        connection.subcloud_group_manager.subcloud_group_detail \
+            .assert_not_called()
+        self.assertEqual(resource.to_dict(), expected)
+        self.assertEqual(resource.to_dict(), expected)
+        self.assertEqual(
+            resource.to_dict(fields=['group_name']),
+            {'1': {'group_name': 'group2'}})
+        # One detail and one group request for the record, however
+        # many times it is assembled.
+        self.assertEqual(
+            connection.subcloud_manager.subcloud_additional_details.mock_calls,
+            [call(1)])
+        self.assertEqual(
+            connection.subcloud_group_manager.subcloud_group_detail
+            .mock_calls,
+            [call(2)])
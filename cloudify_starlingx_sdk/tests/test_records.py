@@ -0,0 +1,108 @@
+# #######
+# Copyright (c) 2021 Cloudify Platform Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from .test_common import StarlingXCommonBase
+from ..records import HostRecord, SubcloudRecord, ApplicationRecord
+from ..resources.configuration import SystemResource
+
+
+class StarlingXRecordsTest(StarlingXCommonBase):
+
+    def test_host_record(self):
+        resource = Mock(resource_id='foo')
+        resource.to_dict.return_value = {
+            'foo': {'hostname': 'controller-0',
+                    'personality': 'controller',
+                    'capabilities': {},
+                    'subfunctions': 'controller'}}
+        record = HostRecord.from_resource(resource)
+        self.assertEqual(record.resource_id, 'foo')
+        self.assertEqual(record.to_dict(), resource.to_dict.return_value)
+        self.assertEqual(record.to_dict(fields=['hostname']),
+                         {'foo': {'hostname': 'controller-0'}})
+        self.assertEqual(record, HostRecord.from_resource(resource))
+        with self.assertRaises(AttributeError):
+            record.hostname = 'controller-1'
+        with self.assertRaises(AttributeError):
+            record.foo = 'bar'
+        self.assertFalse(hasattr(record, '__dict__'))
+
+    @patch('cloudify_starlingx_sdk.resources.distributed_cloud.client')
+    @patch('cloudify_starlingx_sdk.resources.configuration.get_client')
+    def test_system_subcloud_records(self, _, client):
+        subclouds = [SimpleNamespace(subcloud_id=i,
+                                     name='subcloud{}'.format(i),
+                                     description='',
+                                     location='',
+                                     group_id=1,
+                                     oam_floating_ip='10.10.10.{}'.format(i),
+                                     updated_at='2021-10-01 10:00:00',
+                                     availability_status='online',
+                                     management_state='managed')
+                     for i in range(3)]
+        connection = client.client.return_value
+        connection.subcloud_manager.list_subclouds.return_value = subclouds
+        connection.subcloud_manager.subcloud_additional_details.side_effect = \
+            lambda subcloud_id: [subclouds[subcloud_id]]
+        connection.subcloud_group_manager.list_subcloud_groups.return_value = \
+            [SimpleNamespace(group_id=1, name='group1')]
+        resource = SystemResource(
+            client_config={'foo': 'foo', 'bar': 'bar'},
+            resource_config={'uuid': '00000000-0000-0000-0000-000000000000'},
+            logger=Mock()
+        )
+        records = list(resource.iter_subcloud_records())
+        self.assertTrue(all(isinstance(record, SubcloudRecord)
+                            for record in records))
+        self.assertEqual([record.resource_id for record in records],
+                         [0, 1, 2])
+        self.assertEqual(records[2].to_dict()['2']['oam_floating_ip'],
+                         '10.10.10.2')
+        self.assertEqual(records[2].to_dict()['2']['group_name'], 'group1')
+
+    @patch('cloudify_starlingx_sdk.resources.configuration.get_client')
+    def test_system_application_inventory(self, get_client):
+        get_client.return_value.app.list.return_value = [
+            SimpleNamespace(name='platform-integ-apps',
+                            app_version='1.0-8',
+                            status='applied',
+                            manifest_name='platform-integration-manifest',
+                            manifest_file='manifest.yaml'),
+            SimpleNamespace(name='cert-manager',
+                            app_version='1.0-15',
+                            status='uploaded',
+                            manifest_name='cert-manager-manifest',
+                            manifest_file='cert-manager.yaml')]
+        resource = SystemResource(
+            client_config={'foo': 'foo', 'bar': 'bar'},
+            resource_config={'uuid': '00000000-0000-0000-0000-000000000000'},
+            logger=Mock()
+        )
+        self.assertEqual(
+            resource.get_application_inventory(),
+            {'platform-integ-apps': {'app_version': '1.0-8',
+                                     'status': 'applied'},
+             'cert-manager': {'app_version': '1.0-15',
+                              'status': 'uploaded'}})
+        self.assertTrue(all(isinstance(record, ApplicationRecord)
+                            for record in resource.application_records))
+        self.assertEqual(get_client.return_value.app.list.call_count, 1)
+        get_client.return_value.app.get.assert_not_called()
+        resource.invalidate_applications()
+        resource.get_application_inventory()
+        self.assertEqual(get_client.return_value.app.list.call_count, 2)
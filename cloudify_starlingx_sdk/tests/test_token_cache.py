@@ -0,0 +1,106 @@
+# #######
+# Copyright (c) 2021 Cloudify Platform Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import json
+import time
+import hashlib
+import shutil
+import tempfile
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+
+from keystoneauth1 import access
+from keystoneauth1.identity import v3
+
+from .test_common import StarlingXCommonBase
+from ..token_cache import TokenCache
+
+
+class TokenCacheTest(StarlingXCommonBase):
+
+    def setUp(self):
+        super(TokenCacheTest, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache', 'tokens.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super(TokenCacheTest, self).tearDown()
+
+    def test_token_cache_expiry(self):
+        cache = TokenCache(path=self.path, expiry_margin=60)
+        cache.set('foo', 'state', time.time() + 3600)
+        cache.set('bar', 'state', time.time() + 30)
+        self.assertEqual(TokenCache(path=self.path).get('foo'), 'state')
+        self.assertIsNone(cache.get('bar'))
+        self.assertIsNone(cache.get('baz'))
+        cache.delete('foo')
+        self.assertIsNone(cache.get('foo'))
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    def test_token_cache_key(self):
+        cache = TokenCache(path=self.path)
+        key = cache.get_key('http://foo:5000/v3', 'foo', 'bar', 'admin')
+        self.assertEqual(
+            TokenCache(path=self.path).get_key(
+                'http://foo:5000/v3', 'foo', 'bar', 'admin'), key)
+        self.assertNotEqual(
+            cache.get_key('http://foo:5000/v3', 'foo', 'baz', 'admin'), key)
+        # The key is not a plain hash of the credentials.
+        self.assertNotEqual(hashlib.sha256(json.dumps(
+            ['http://foo:5000/v3', 'foo', 'bar', 'admin', None, None]
+        ).encode('utf-8')).hexdigest(), key)
+        self.assertEqual(
+            os.stat(self.path + '.key').st_mode & 0o777, 0o600)
+
+    def test_token_cache_session(self):
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+        body = {'token': {
+            'expires_at': expires_at.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+            'catalog': []}}
+
+        def get_access(auth, _):
+            auth.auth_ref = access.create(body=body, auth_token='token')
+            return auth.auth_ref
+
+        config = {'auth_url': 'http://foo:5000/v3',
+                  'username': 'foo',
+                  'password': 'bar',
+                  'project_name': 'admin'}
+        with patch.object(v3.Password, 'get_access', autospec=True,
+                          side_effect=get_access) as mock_get_access:
+            TokenCache(path=self.path).get_session(**config)
+            sess = TokenCache(path=self.path).get_session(**config)
+            self.assertEqual(sess.auth.auth_ref.auth_token, 'token')
+            self.assertEqual(mock_get_access.call_count, 1)
+            # Other credentials do not share the token.
+            config['username'] = 'baz'
+            TokenCache(path=self.path).get_session(**config)
+            self.assertEqual(mock_get_access.call_count, 2)
+            # Nor does another password of the same user.
+            config['password'] = 'qux'
+            TokenCache(path=self.path).get_session(**config)
+            self.assertEqual(mock_get_access.call_count, 3)
+            # A token that the server rejects is removed from the cache.
+            sess = TokenCache(path=self.path).get_session(**config)
+            self.assertEqual(mock_get_access.call_count, 3)
+            self.assertTrue(sess.invalidate())
+            self.assertIsNone(TokenCache(path=self.path).get(
+                sess.auth.cache_key))
+            sess.auth.get_access(sess)
+            self.assertEqual(mock_get_access.call_count, 4)
+            self.assertIsNotNone(TokenCache(path=self.path).get(
+                sess.auth.cache_key))
@@ -0,0 +1,207 @@
+# #######
+# Copyright (c) 2021 Cloudify Platform Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import hmac
+import json
+import time
+import fcntl
+import hashlib
+import tempfile
+from contextlib import contextmanager
+
+from keystoneauth1 import session
+from keystoneauth1.identity import v3
+
+from .constants import DEFAULT_TOKEN_CACHE_PATH, TOKEN_EXPIRY_MARGIN
+
+
+class CachedPassword(v3.Password):
+    """A password auth plugin that stores the tokens that it gets in a
+    TokenCache, and removes a token from the cache when the session
+    invalidates it, e.g. after a 401 response to a revoked token.
+    """
+
+    def __init__(self, *args, token_cache=None, cache_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.token_cache = token_cache
+        self.cache_key = cache_key
+        self._cached_token = None
+
+    def set_auth_state(self, data):
+        super().set_auth_state(data)
+        if self.auth_ref:
+            self._cached_token = self.auth_ref.auth_token
+
+    def get_access(self, session, **kwargs):
+        auth_ref = super().get_access(session, **kwargs)
+        if auth_ref.auth_token != self._cached_token:
+            self.token_cache.set(self.cache_key,
+                                 self.get_auth_state(),
+                                 auth_ref.expires.timestamp())
+            self._cached_token = auth_ref.auth_token
+        return auth_ref
+
+    def invalidate(self):
+        if self._cached_token:
+            self.token_cache.delete(self.cache_key)
+            self._cached_token = None
+        return super().invalidate()
+
+
+class TokenCache(object):
+    """A cache of keystone tokens in a local JSON file, which is shared by
+    all the operations and workflows that run on the manager, so that they
+    do not each authenticate with the same credentials.
+    Tokens are keyed by a hash of the auth URL, the user, the password, the
+    project and the domains, and are not used if they expire within
+    expiry_margin seconds. A token that the server rejects is removed. The
+    file is locked while it is read or written.
+    """
+
+    def __init__(self, path=None, expiry_margin=TOKEN_EXPIRY_MARGIN):
+        self.path = path or DEFAULT_TOKEN_CACHE_PATH
+        self.expiry_margin = expiry_margin
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, mode=0o700)
+
+    def get_secret(self):
+        """ Get the secret of the cache keys, which is created with the
+        cache, and is only readable by its owner.
+        """
+        path = self.path + '.key'
+        if not os.path.exists(path):
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path) or '.')
+            with os.fdopen(fd, 'wb') as outfile:
+                outfile.write(os.urandom(32))
+            try:
+                # The link fails if another process created the secret
+                # first, so every process uses the same, complete secret.
+                os.link(tmp_path, path)
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(tmp_path)
+        with open(path, 'rb') as infile:
+            return infile.read()
+
+    def get_key(self,
+                auth_url,
+                username,
+                password,
+                project_name,
+                user_domain=None,
+                project_domain=None):
+        # An HMAC, so that the file offers no hash of the password to guess.
+        return hmac.new(self.get_secret(), json.dumps(
+            [auth_url,
+             username,
+             password,
+             project_name,
+             user_domain,
+             project_domain]
+        ).encode('utf-8'), hashlib.sha256).hexdigest()
+
+    @contextmanager
+    def locked(self, exclusive=False):
+        with open(self.path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file,
+                        fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as infile:
+                return json.load(infile)
+        except (IOError, ValueError):
+            return {}
+
+    def _write(self, tokens):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.')
+        with os.fdopen(fd, 'w') as outfile:
+            json.dump(tokens, outfile)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, self.path)
+
+    def is_valid(self, token):
+        return token['expires_at'] - self.expiry_margin > time.time()
+
+    def get(self, key):
+        """ Get the auth state of a valid token, or None. """
+        with self.locked():
+            token = self._read().get(key)
+        if token and self.is_valid(token):
+            return token['auth_state']
+
+    def set(self, key, auth_state, expires_at):
+        with self.locked(exclusive=True):
+            tokens = {k: v for k, v in self._read().items()
+                      if self.is_valid(v)}
+            tokens[key] = {'auth_state': auth_state, 'expires_at': expires_at}
+            self._write(tokens)
+
+    def delete(self, key):
+        with self.locked(exclusive=True):
+            tokens = self._read()
+            if tokens.pop(key, None):
+                self._write(tokens)
+
+    def get_session(self,
+                    auth_url,
+                    username,
+                    password,
+                    project_name,
+                    user_domain_name=None,
+                    project_domain_name=None,
+                    user_domain_id=None,
+                    project_domain_id=None,
+                    verify=True):
+        """ Create a keystone session that starts with a cached token if
+        there is one. Otherwise it authenticates, and caches the new token.
+        If the server rejects the cached token, it is removed from the cache
+        and the session authenticates again.
+        """
+        if not (user_domain_name or user_domain_id):
+            user_domain_name = 'Default'
+        if not (project_domain_name or project_domain_id):
+            project_domain_name = 'Default'
+        key = self.get_key(auth_url,
+                           username,
+                           password,
+                           project_name,
+                           user_domain_name or user_domain_id,
+                           project_domain_name or project_domain_id)
+        auth = CachedPassword(auth_url=auth_url,
+                              username=username,
+                              password=password,
+                              project_name=project_name,
+                              user_domain_name=user_domain_name,
+                              user_domain_id=user_domain_id,
+                              project_domain_name=project_domain_name,
+                              project_domain_id=project_domain_id,
+                              token_cache=self,
+                              cache_key=key)
+        sess = session.Session(auth=auth, verify=verify)
+        auth_state = self.get(key)
+        if auth_state:
+            auth.set_auth_state(auth_state)
+        else:
+            auth.get_access(sess)
+        return sess